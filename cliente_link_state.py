@@ -7,16 +7,16 @@ import socket
 import json
 import time
 import threading
+import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
+from protocolo import PUERTOS_NODOS, dumps, loads, enviar_frame, recibir_frame
 
 class LinkStateClient:
     """Cliente para interactuar con nodos Link State"""
     
     def __init__(self):
-        self.puertos_nodos = {
-            'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
-            'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
-        }
+        self.puertos_nodos = PUERTOS_NODOS
         self.host = '127.0.0.1'
         
     def enviar_comando(self, nodo: str, comando: dict) -> Optional[dict]:
@@ -31,13 +31,12 @@ class LinkStateClient:
                 sock.connect((self.host, self.puertos_nodos[nodo]))
                 
                 # Enviar comando
-                mensaje = json.dumps(comando).encode('utf-8')
-                sock.send(mensaje)
+                enviar_frame(sock, dumps(comando))
                 
                 # Recibir respuesta
-                respuesta = sock.recv(4096).decode('utf-8')
+                respuesta = recibir_frame(sock)
                 if respuesta:
-                    return json.loads(respuesta)
+                    return loads(respuesta)
                     
         except ConnectionRefusedError:
             print(f"❌ No se puede conectar al nodo {nodo} (puerto {self.puertos_nodos[nodo]})")
@@ -71,9 +70,10 @@ class LinkStateClient:
             print(f"❌ No se pudo obtener estado de {nodo}")
             return None
             
-    def mostrar_tabla_enrutamiento(self, nodo: str):
-        """Muestra la tabla de enrutamiento de un nodo"""
-        estado = self.obtener_estado_nodo(nodo)
+    def mostrar_tabla_enrutamiento(self, nodo: str, estado: Optional[dict] = None):
+        """Muestra la tabla de enrutamiento de un nodo (usa el estado dado si ya se obtuvo)"""
+        if estado is None:
+            estado = self.obtener_estado_nodo(nodo)
         if not estado:
             return
             
@@ -89,16 +89,17 @@ class LinkStateClient:
             for dest in sorted(tabla.keys()):
                 info = tabla[dest]
                 next_hop = info.get('next_hop', 'N/A')
-                distance = info.get('distance', float('inf'))
-                distance_str = str(int(distance)) if distance != float('inf') else "∞"
+                distance = info.get('distance', math.inf)
+                distance_str = str(int(distance)) if distance != math.inf else "∞"
                 
                 print(f"{dest:7} | {next_hop:8} | {distance_str:9} | Activa")
                 
         print("-" * 45)
         
-    def mostrar_lsdb(self, nodo: str):
-        """Muestra la base de datos Link State de un nodo"""
-        estado = self.obtener_estado_nodo(nodo)
+    def mostrar_lsdb(self, nodo: str, estado: Optional[dict] = None):
+        """Muestra la base de datos Link State de un nodo (usa el estado dado si ya se obtuvo)"""
+        if estado is None:
+            estado = self.obtener_estado_nodo(nodo)
         if not estado:
             return
             
@@ -112,14 +113,14 @@ class LinkStateClient:
         print(f"LSPs recibidos: {stats.get('lsps_recibidos', 0)}")
         print(f"Tablas calculadas: {stats.get('tablas_calculadas', 0)}")
         
-    def comparar_tablas_enrutamiento(self, nodos: List[str]):
+    def comparar_tablas_enrutamiento(self, nodos: List[str], estados_previos: Optional[Dict[str, Optional[dict]]] = None):
         """Compara las tablas de enrutamiento de múltiples nodos"""
         print(f"\n🔍 COMPARACIÓN DE TABLAS DE ENRUTAMIENTO")
         print("=" * 60)
         
         estados = {}
         for nodo in nodos:
-            estado = self.obtener_estado_nodo(nodo)
+            estado = estados_previos[nodo] if estados_previos and nodo in estados_previos else self.obtener_estado_nodo(nodo)
             if estado:
                 estados[nodo] = estado.get('routing_table', {})
             else:
@@ -143,19 +144,19 @@ class LinkStateClient:
                 if destino in tabla and destino != nodo:
                     info = tabla[destino]
                     path = info.get('path', [])
-                    distance = info.get('distance', float('inf'))
+                    distance = info.get('distance', math.inf)
                     ruta_str = " -> ".join(path) if path else "N/A"
                     rutas_encontradas[nodo] = (ruta_str, distance)
                 else:
-                    rutas_encontradas[nodo] = ("SIN RUTA", float('inf'))
+                    rutas_encontradas[nodo] = ("SIN RUTA", math.inf)
                     
             # Mostrar rutas
             for nodo, (ruta, distancia) in rutas_encontradas.items():
-                dist_str = str(int(distancia)) if distancia != float('inf') else "∞"
+                dist_str = str(int(distancia)) if distancia != math.inf else "∞"
                 print(f"  {nodo}: {ruta} (costo: {dist_str})")
                 
             # Verificar consistencia
-            distancias = [d for _, d in rutas_encontradas.values() if d != float('inf')]
+            distancias = [d for _, d in rutas_encontradas.values() if d != math.inf]
             if distancias and len(set(distancias)) > 1:
                 print("  ⚠️  INCONSISTENCIA: Diferentes costos para el mismo destino")
                 
@@ -170,8 +171,13 @@ class LinkStateClient:
         activos = []
         inactivos = []
         
-        for nodo in nodos:
-            if self.verificar_conectividad(nodo):
+        # Probar todos los nodos a la vez: un nodo caído (timeout de 5 s)
+        # ya no retrasa la prueba de los demás
+        with ThreadPoolExecutor(max_workers=max(1, min(len(nodos), 16))) as pool:
+            resultados = list(pool.map(self.verificar_conectividad, nodos))
+            
+        for nodo, responde in zip(nodos, resultados):
+            if responde:
                 activos.append(nodo)
             else:
                 inactivos.append(nodo)
@@ -188,28 +194,32 @@ class LinkStateClient:
         print(f"\n📡 MONITOREANDO CONVERGENCIA ({duracion} segundos)")
         print("=" * 50)
         
-        inicio = time.time()
+        inicio = time.monotonic()  # Reloj monótono: no salta con ajustes de hora del sistema
+        intervalo = 5
         iteracion = 0
         
-        while time.time() - inicio < duracion:
-            iteracion += 1
-            print(f"\n--- Iteración {iteracion} (t={int(time.time() - inicio)}s) ---")
-            
-            # Obtener estadísticas de cada nodo
-            for nodo in nodos:
-                estado = self.obtener_estado_nodo(nodo)
-                if estado:
-                    stats = estado.get('estadisticas', {})
-                    rutas = len(estado.get('routing_table', {}))
-                    lsdb_size = estado.get('lsdb_size', 0)
-                    version = estado.get('topology_version', 0)
-                    
-                    print(f"  {nodo}: {rutas} rutas, LSDB={lsdb_size}, v={version}")
-                else:
-                    print(f"  {nodo}: ❌ No responde")
-                    
-            time.sleep(5)  # Esperar 5 segundos entre iteraciones
-            
+        with ThreadPoolExecutor(max_workers=max(1, min(len(nodos), 16))) as pool:
+            while time.monotonic() - inicio < duracion:
+                iteracion += 1
+                print(f"\n--- Iteración {iteracion} (t={int(time.monotonic() - inicio)}s) ---")
+                
+                # Obtener estadísticas de todos los nodos a la vez
+                estados = pool.map(self.obtener_estado_nodo, nodos)
+                for nodo, estado in zip(nodos, estados):
+                    if estado:
+                        stats = estado.get('estadisticas', {})
+                        rutas = len(estado.get('routing_table', {}))
+                        lsdb_size = estado.get('lsdb_size', 0)
+                        version = estado.get('topology_version', 0)
+                        
+                        print(f"  {nodo}: {rutas} rutas, LSDB={lsdb_size}, v={version}")
+                    else:
+                        print(f"  {nodo}: ❌ No responde")
+                        
+                # Dormir hasta la próxima marca de 5 s: el tiempo de las consultas
+                # no se acumula sobre el periodo de muestreo
+                time.sleep(max(0, inicio + iteracion * intervalo - time.monotonic()))
+                
         print(f"\n✅ Monitoreo completado")
         
     def ejecutar_demo_basico(self):
@@ -226,20 +236,25 @@ class LinkStateClient:
             
         print(f"✅ Usando nodos: {activos}")
         
+        # Una sola consulta de estado por nodo (en paralelo), reutilizada por
+        # las tablas, la comparación y las estadísticas de abajo
+        with ThreadPoolExecutor(max_workers=len(activos)) as pool:
+            estados = dict(zip(activos, pool.map(self.obtener_estado_nodo, activos)))
+        
         # 2. Mostrar estado inicial
         print(f"\n📋 ESTADO INICIAL")
         print("-" * 30)
         for nodo in activos[:3]:  # Mostrar solo los primeros 3
-            self.mostrar_tabla_enrutamiento(nodo)
+            self.mostrar_tabla_enrutamiento(nodo, estados[nodo])
             
         # 3. Comparar tablas
-        self.comparar_tablas_enrutamiento(activos)
+        self.comparar_tablas_enrutamiento(activos, estados)
         
         # 4. Mostrar estadísticas LSDB
         print(f"\n📊 ESTADÍSTICAS LSDB")
         print("-" * 30)
         for nodo in activos:
-            self.mostrar_lsdb(nodo)
+            self.mostrar_lsdb(nodo, estados[nodo])
             
     def menu_interactivo(self):
         """Menú interactivo para el cliente"""
@@ -1,18 +1,17 @@
 import threading
 import time
 import json
+import os
 from typing import Dict, List
 from grafo import grafo
 from nodo import Nodo
+from protocolo import PUERTOS_NODOS
 
 class CoordinadorRed:
     def __init__(self):
         self.grafo_red = self.crear_grafo()
         self.nodos = {}
-        self.puertos_nodos = {
-            'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
-            'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
-        }
+        self.puertos_nodos = PUERTOS_NODOS
         self.hilos_nodos = []
         
     def crear_grafo(self):
@@ -91,7 +90,6 @@ class CoordinadorRed:
                 
     def guardar_tablas_distribuidas(self, carpeta: str = "tablas_distribuidas"):
         """Guarda las tablas calculadas por el sistema distribuido"""
-        import os
         os.makedirs(carpeta, exist_ok=True)
         
         for nombre_nodo, nodo in self.nodos.items():
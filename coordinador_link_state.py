@@ -10,17 +10,16 @@ import json
 import threading
 import os
 import signal
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
+from protocolo import PUERTOS_NODOS, dumps, loads, enviar_frame, recibir_frame
 
 class LinkStateCoordinator:
     """Coordinador para gestionar múltiples nodos Link State"""
     
     def __init__(self):
         self.procesos = {}  # {nombre: subprocess.Popen}
-        self.puertos_nodos = {
-            'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
-            'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
-        }
+        self.puertos_nodos = PUERTOS_NODOS
         self.host = '127.0.0.1'
         self.activo = True
         
@@ -115,26 +114,38 @@ class LinkStateCoordinator:
             print(f"❌ Error deteniendo nodo {nombre}: {e}")
             return False
             
-    def iniciar_red_completa(self, nodos: List[str] = None):
+    def iniciar_red_completa(self, nodos: List[str] = None, timeout_convergencia: float = 10.0):
         """Inicia todos los nodos o una lista específica"""
         if nodos is None:
             nodos = list(self.puertos_nodos.keys())
             
         print(f"🚀 Iniciando red Link State con nodos: {nodos}")
         
-        exitos = 0
-        for nombre in nodos:
-            if self.iniciar_nodo(nombre):
-                exitos += 1
-                time.sleep(0.5)  # Pausa pequeña entre inicios
+        # Popen no bloquea: todos los procesos arrancan a la vez
+        iniciados = [nombre for nombre in nodos if self.iniciar_nodo(nombre)]
                 
-        print(f"✅ Red iniciada: {exitos}/{len(nodos)} nodos activos")
+        print(f"✅ Red iniciada: {len(iniciados)}/{len(nodos)} nodos activos")
         
         # Esperar convergencia
-        if exitos > 0:
-            print("⏳ Esperando convergencia inicial (10 segundos)...")
-            time.sleep(10)
-            print("✅ Convergencia completada")
+        if iniciados:
+            print(f"⏳ Esperando convergencia inicial (máx. {timeout_convergencia:g} segundos)...")
+            if self.esperar_convergencia(iniciados, timeout_convergencia):
+                print("✅ Convergencia completada")
+            else:
+                print("⚠️ Tiempo de espera agotado sin convergencia completa")
+                
+    def esperar_convergencia(self, nodos: List[str], timeout: float, intervalo: float = 0.5) -> bool:
+        """Sondea los nodos hasta que todas sus LSDB tienen un LSP por nodo iniciado"""
+        limite = time.monotonic() + timeout
+        with ThreadPoolExecutor(max_workers=min(len(nodos), 16)) as pool:
+            while True:
+                estados = pool.map(lambda nombre: self.obtener_estado_nodo(nombre, reportar_errores=False), nodos)
+                if all(estado and estado.get('lsdb_size', 0) >= len(nodos) for estado in estados):
+                    return True
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return False
+                time.sleep(min(intervalo, restante))
             
     def detener_red_completa(self):
         """Detiene todos los nodos"""
@@ -146,12 +157,13 @@ class LinkStateCoordinator:
             
         print(f"🛑 Deteniendo nodos: {nodos_activos}")
         
-        for nombre in nodos_activos:
-            self.detener_nodo(nombre)
+        # Cada detención puede esperar hasta 5 s: se hacen todas a la vez
+        with ThreadPoolExecutor(max_workers=min(len(nodos_activos), 16)) as pool:
+            list(pool.map(self.detener_nodo, nodos_activos))
             
         print("✅ Todos los nodos detenidos")
         
-    def obtener_estado_nodo(self, nombre: str) -> Optional[Dict]:
+    def obtener_estado_nodo(self, nombre: str, reportar_errores: bool = True) -> Optional[Dict]:
         """Obtiene el estado de un nodo via socket"""
         if nombre not in self.puertos_nodos:
             return None
@@ -162,15 +174,16 @@ class LinkStateCoordinator:
                 sock.connect((self.host, self.puertos_nodos[nombre]))
                 
                 mensaje = {'tipo': 'get_status'}
-                sock.send(json.dumps(mensaje).encode('utf-8'))
+                enviar_frame(sock, dumps(mensaje))
                 
-                respuesta = sock.recv(4096).decode('utf-8')
+                respuesta = recibir_frame(sock)
                 if respuesta:
-                    datos = json.loads(respuesta)
+                    datos = loads(respuesta)
                     return datos.get('estado')
                     
         except Exception as e:
-            print(f"❌ Error obteniendo estado de {nombre}: {e}")
+            if reportar_errores:
+                print(f"❌ Error obteniendo estado de {nombre}: {e}")
             
         return None
         
@@ -199,8 +212,12 @@ class LinkStateCoordinator:
         print(f"Nodos activos: {', '.join(sorted(activos))}")
         print()
         
-        for nombre in sorted(activos):
-            estado = self.obtener_estado_nodo(nombre)
+        # Consultar todos los nodos a la vez: la espera total es la del más lento
+        nombres = sorted(activos)
+        with ThreadPoolExecutor(max_workers=min(len(nombres), 16)) as pool:
+            estados = list(pool.map(self.obtener_estado_nodo, nombres))
+            
+        for nombre, estado in zip(nombres, estados):
             if estado:
                 print(f"--- Nodo {nombre} ---")
                 print(f"  Vecinos: {estado.get('vecinos', {})}")
@@ -1,7 +1,9 @@
 # dijkstra.py
 from typing import Dict, Optional, List, Tuple
 import heapq
+from collections import deque
 import os, json
+import math
 
 
 # Importa tu clase grafo
@@ -15,7 +17,7 @@ def dijkstra(G: grafo, source: str) -> Tuple[Dict[str, float], Dict[str, Optiona
       - prev[nodo] = predecesor en el camino más corto (None si no hay)
     """
     # Inicialización
-    dist: Dict[str, float] = {r: float("inf") for r in G.routers}
+    dist: Dict[str, float] = {r: math.inf for r in G.routers}
     prev: Dict[str, Optional[str]] = {r: None for r in G.routers}
     dist[source] = 0.0
 
@@ -25,17 +27,15 @@ def dijkstra(G: grafo, source: str) -> Tuple[Dict[str, float], Dict[str, Optiona
 
     while pq:
         d, u = heapq.heappop(pq)
+        # Entradas desactualizadas: la primera vez que sale u ya trae su
+        # distancia definitiva (pesos no negativos), las demás se descartan aquí
         if u in visited:
             continue
         visited.add(u)
 
-        # Si el elemento extraído está desactualizado, sáltalo
-        if d > dist[u]:
-            continue
-
         # Relajar aristas u -> v
         for v, w in G.conexiones.get(u, {}).items():
-            alt = dist[u] + w
+            alt = d + w  # d == dist[u] al ser la primera salida de u
             if alt < dist[v]:
                 dist[v] = alt
                 prev[v] = u
@@ -65,14 +65,41 @@ def first_hop(source: str, dest: str, prev: Dict[str, Optional[str]]) -> Optiona
     return path[1] if len(path) >= 2 else None
 
 
+def primeros_saltos(source: str, prev: Dict[str, Optional[str]]) -> Dict[str, str]:
+    """
+    Obtiene el next-hop de todos los destinos alcanzables en una sola pasada
+    sobre 'prev' (O(V)), en vez de recorrer la cadena de cada destino con first_hop.
+    Los destinos sin ruta y el propio source no aparecen en el resultado.
+    """
+    # Invertir prev: hijos[u] = nodos cuyo predecesor es u (árbol de caminos mínimos)
+    hijos: Dict[str, List[str]] = {}
+    for nodo, padre in prev.items():
+        if padre is not None:
+            hijos.setdefault(padre, []).append(nodo)
+
+    # Recorrer el árbol desde source: cada nodo hereda el primer salto de su padre
+    saltos: Dict[str, str] = {}
+    pendientes = deque()
+    for vecino in hijos.get(source, []):
+        saltos[vecino] = vecino
+        pendientes.append(vecino)
+    while pendientes:
+        u = pendientes.popleft()
+        for v in hijos.get(u, []):
+            saltos[v] = saltos[u]
+            pendientes.append(v)
+    return saltos
+
+
 def forwarding_table(G: grafo, source: str) -> List[Tuple[str, Optional[str], float]]:
     """
     Construye la tabla de enrutamiento (destino, next-hop, costo_total) para 'source'.
     """
     dist, prev = dijkstra(G, source)
+    saltos = primeros_saltos(source, prev)
     filas: List[Tuple[str, Optional[str], float]] = []
     for dest in sorted(G.routers):
-        nh = first_hop(source, dest, prev)
+        nh = saltos.get(dest)
         filas.append((dest, nh, dist[dest]))
     return filas
 
@@ -99,9 +126,10 @@ def construir_tablas_para_todos(G: grafo, incluir_ruta: bool = False) -> Dict[st
     tablas: Dict[str, List[Tuple[str, Optional[str], float, Optional[List[str]]]]] = {}
     for origen in sorted(G.routers):
         dist, prev = dijkstra(G, origen)
+        saltos = primeros_saltos(origen, prev)
         filas = []
         for dest in sorted(G.routers):
-            nh = first_hop(origen, dest, prev)
+            nh = saltos.get(dest)
             ruta = reconstruir_ruta(origen, dest, prev) if incluir_ruta else None
             filas.append((dest, nh, dist[dest], ruta))
         tablas[origen] = filas
@@ -112,7 +140,7 @@ def imprimir_tabla(origen: str, filas: List[Tuple[str, Optional[str], float, Opt
     print("Destino | next-hop | costo | ruta")
     print("-------------------------------------------")
     for dest, nh, cost, ruta in filas:
-        costo_str = "∞" if cost == float("inf") else (f"{int(cost)}" if float(cost).is_integer() else f"{cost:.3f}")
+        costo_str = "∞" if cost == math.inf else (f"{int(cost)}" if float(cost).is_integer() else f"{cost:.3f}")
         nh_str = nh if nh is not None else "-"
         ruta_str = "->".join(ruta) if ruta else "-"
         print(f"{dest:7} {nh_str:9} {costo_str:6}  {ruta_str}")
@@ -130,7 +158,7 @@ def guardar_tablas_json(tablas: Dict[str, List[Tuple[str, Optional[str], float,
             data.append({
                 "destino": dest,
                 "next_hop": nh if nh is not None else "",
-                "costo": cost if cost != float("inf") else None,
+                "costo": cost if cost != math.inf else None,
                 "ruta": ruta if ruta else []
             })
         ruta_archivo = os.path.join(carpeta, f"tabla_{origen}.json")
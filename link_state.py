@@ -7,18 +7,28 @@ import json
 import time
 import copy
 import hashlib
+import heapq
+import math
 from typing import Dict, List, Set, Tuple, Optional
-from dijkstra import dijkstra, construir_tablas_para_todos, first_hop
+from dijkstra import dijkstra, construir_tablas_para_todos, primeros_saltos
 from grafo import grafo
 
+# json.dumps con argumentos no por defecto crea un JSONEncoder nuevo en cada
+# llamada; este se construye una sola vez y se reutiliza en get_hash
+_CODIFICADOR_ORDENADO = json.JSONEncoder(sort_keys=True)
+
 class LSP:
     """Link State Packet - Paquete de Estado de Enlace"""
-    def __init__(self, source: str, sequence_num: int, age: int, neighbors: Dict[str, int]):
+    # Atributos fijos: sin __dict__ por instancia (hay un LSP por nodo en cada LSDB)
+    __slots__ = ('source', 'sequence_num', 'age', 'neighbors', 'timestamp')
+    
+    def __init__(self, source: str, sequence_num: int, age: int, neighbors: Dict[str, int],
+                 timestamp: Optional[float] = None):
         self.source = source  # Nodo origen del LSP
         self.sequence_num = sequence_num  # Número de secuencia
         self.age = age  # Edad del paquete (TTL)
         self.neighbors = neighbors.copy()  # Vecinos y costos: {vecino: costo}
-        self.timestamp = time.time()  # Marca de tiempo de creación
+        self.timestamp = time.time() if timestamp is None else timestamp  # Marca de tiempo de creación
         
     def to_dict(self) -> dict:
         """Convierte el LSP a diccionario para serialización"""
@@ -33,13 +43,11 @@ class LSP:
     @classmethod
     def from_dict(cls, data: dict):
         """Crea un LSP desde un diccionario"""
-        lsp = cls(data['source'], data['sequence_num'], data['age'], data['neighbors'])
-        lsp.timestamp = data['timestamp']
-        return lsp
+        return cls(data['source'], data['sequence_num'], data['age'], data['neighbors'], data['timestamp'])
     
     def get_hash(self) -> str:
         """Genera un hash único para el LSP basado en su contenido"""
-        content = f"{self.source}-{self.sequence_num}-{json.dumps(self.neighbors, sort_keys=True)}"
+        content = f"{self.source}-{self.sequence_num}-{_CODIFICADOR_ORDENADO.encode(self.neighbors)}"
         return hashlib.md5(content.encode()).hexdigest()[:8]
 
 class LinkStateDB:
@@ -47,6 +55,11 @@ class LinkStateDB:
     def __init__(self):
         self.lsp_db: Dict[str, LSP] = {}  # {source: LSP_más_reciente}
         self.topology_version = 0
+        # Grafo de topología que se mantiene al día con cada cambio de la LSDB
+        self._grafo = grafo()
+        self._enlaces_entrantes: Dict[str, int] = {}  # {router: enlaces que llegan a él}
+        # Heap (timestamp, source) para encontrar los LSPs vencidos sin recorrer toda la LSDB
+        self._vencimientos: List[Tuple[float, str]] = []
         
     def update_lsp(self, lsp: LSP) -> bool:
         """
@@ -78,35 +91,75 @@ class LinkStateDB:
         
         if updated:
             self.topology_version += 1
+            self._actualizar_grafo(source, lsp.neighbors)
+            self._registrar_vencimiento(lsp)
             
         return updated
     
+    def _registrar_vencimiento(self, lsp: LSP):
+        """
+        Agrega el LSP al heap de vencimientos. Cada actualización deja atrás la
+        entrada del LSP reemplazado: cuando las entradas superan el doble de la
+        LSDB se reconstruye el heap solo con los LSPs vigentes, así que su tamaño
+        queda acotado aunque nunca se llame a cleanup_old_lsps.
+        """
+        heapq.heappush(self._vencimientos, (lsp.timestamp, lsp.source))
+        if len(self._vencimientos) > 2 * len(self.lsp_db):
+            self._vencimientos = [(actual.timestamp, source) for source, actual in self.lsp_db.items()]
+            heapq.heapify(self._vencimientos)
+    
+    def _actualizar_grafo(self, source: str, neighbors: Optional[Dict[str, int]]):
+        """
+        Reemplaza solo los enlaces salientes de 'source' en el grafo
+        (neighbors=None si su LSP fue eliminado), sin reconstruirlo completo.
+        """
+        anteriores = self._grafo.conexiones.pop(source, {})
+        for neighbor in anteriores:
+            self._enlaces_entrantes[neighbor] -= 1
+            
+        nuevos = {neighbor: int(cost) for neighbor, cost in (neighbors or {}).items()}
+        if nuevos:
+            self._grafo.conexiones[source] = nuevos
+        for neighbor in nuevos:
+            self._enlaces_entrantes[neighbor] = self._enlaces_entrantes.get(neighbor, 0) + 1
+            
+        # Igual que al construir el grafo desde cero: un router existe
+        # mientras tenga algún enlace saliente o entrante. conexiones es un
+        # defaultdict (leerlo puede dejar un dict vacío), por eso se mira si
+        # tiene enlaces y no solo si la clave está
+        for router in anteriores.keys() | nuevos.keys() | {source}:
+            if self._grafo.conexiones.get(router) or self._enlaces_entrantes.get(router, 0) > 0:
+                self._grafo.routers.add(router)
+            else:
+                self._grafo.routers.discard(router)
+                self._grafo.conexiones.pop(router, None)
+    
     def get_topology_graph(self) -> grafo:
         """
-        Construye el grafo de topología completa desde la LSDB
+        Devuelve el grafo de topología completa de la LSDB.
+        Se actualiza incrementalmente en update_lsp/cleanup_old_lsps, así que
+        no hay que reconstruirlo en cada cálculo (tratarlo como solo lectura).
         """
-        g = grafo()
-        
-        # Agregar todos los enlaces desde cada LSP
-        for source, lsp in self.lsp_db.items():
-            for neighbor, cost in lsp.neighbors.items():
-                g.agregar_conexion(source, neighbor, cost, bidireccional=False)
-                
-        return g
+        return self._grafo
     
     def cleanup_old_lsps(self, max_age: int = 300):
         """Elimina LSPs antiguos (mayor a max_age segundos)"""
         current_time = time.time()
         to_remove = []
         
-        for source, lsp in self.lsp_db.items():
-            if current_time - lsp.timestamp > max_age:
+        # Solo se revisan las entradas vencidas del heap (las más antiguas primero).
+        # Puede haber varias por nodo o de LSPs ya reemplazados: se confirma con el LSP actual
+        while self._vencimientos and current_time - self._vencimientos[0][0] > max_age:
+            _, source = heapq.heappop(self._vencimientos)
+            lsp = self.lsp_db.get(source)
+            if lsp is not None and current_time - lsp.timestamp > max_age and source not in to_remove:
                 to_remove.append(source)
                 
         for source in to_remove:
             del self.lsp_db[source]
             print(f"[LSDB] LSP de {source} eliminado por antigüedad")
             self.topology_version += 1
+            self._actualizar_grafo(source, None)
     
     def print_database(self):
         """Imprime el contenido de la base de datos"""
@@ -187,16 +240,17 @@ class LinkStateNode:
         
         # Construir tabla de enrutamiento
         self.routing_table = {}
+        saltos = primeros_saltos(self.name, predecessors)
         
         for dest in topology_graph.routers:
             if dest == self.name:
                 continue
                 
             distance = distances[dest]
-            if distance == float('inf'):
+            if distance == math.inf:
                 continue
                 
-            next_hop = first_hop(self.name, dest, predecessors)
+            next_hop = saltos.get(dest)
             if next_hop:
                 self.routing_table[dest] = {
                     'next_hop': next_hop,
@@ -265,7 +319,7 @@ class LinkStateNode:
         for dest in sorted(self.routing_table.keys()):
             info = self.routing_table[dest]
             path_str = " -> ".join(info['path'])
-            distance_str = str(int(info['distance'])) if info['distance'] != float('inf') else "∞"
+            distance_str = str(int(info['distance'])) if info['distance'] != math.inf else "∞"
             
             print(f"{dest:7} | {info['next_hop']:8} | {distance_str:9} | {path_str}")
         
@@ -318,18 +372,14 @@ def simulacion_link_state():
     print("="*80)
     
     # Simular intercambio de LSPs entre todos los nodos
-    all_lsps = []
-    
-    # Recolectar todos los LSPs generados
-    for node in nodes.values():
-        lsp = node.lsdb.lsp_db[node.name]  # Su propio LSP
-        all_lsps.append(lsp)
+    # Recolectar todos los LSPs generados, indexados por su origen
+    lsps_por_origen = {name: node.lsdb.lsp_db[name] for name, node in nodes.items()}
     
     # Distribuir LSPs a todos los nodos
-    for node in nodes.values():
-        print(f"\n[FLOODING] Enviando LSPs a nodo {node.name}")
-        for lsp in all_lsps:
-            if lsp.source != node.name:  # No enviar su propio LSP
+    for name, node in nodes.items():
+        print(f"\n[FLOODING] Enviando LSPs a nodo {name}")
+        for origen, lsp in lsps_por_origen.items():
+            if origen != name:  # No enviar su propio LSP
                 node.receive_lsp(lsp)
     
     print("\n" + "="*80)
@@ -361,8 +411,9 @@ def simulacion_link_state():
     
     # Propagar los cambios
     print("\n[FLOODING] Propagando cambios por falla de enlace...")
+    excluidos = frozenset({'F', 'H'})
     for node in nodes.values():
-        if node.name not in ['F', 'H']:  # Los nodos afectados ya se actualizaron
+        if node.name not in excluidos:  # Los nodos afectados ya se actualizaron
             for lsp in new_lsps:
                 node.receive_lsp(lsp)
     
@@ -392,8 +443,9 @@ def simulacion_link_state():
         nodes['H'].lsdb.lsp_db['H']
     ]
     
+    excluidos = frozenset({'F', 'H'})
     for node in nodes.values():
-        if node.name not in ['F', 'H']:
+        if node.name not in excluidos:
             for lsp in recovery_lsps:
                 node.receive_lsp(lsp)
     
@@ -4,13 +4,17 @@ Pero usa protocolo Link State real para calcular rutas dinámicamente
 """
 
 import socket
-import json
 import threading
 import time
 import sys
+import math
 from typing import Dict, List, Optional
 from dijkstra import dijkstra, first_hop
 from grafo import grafo
+from protocolo import PUERTOS_NODOS, dumps, loads
+
+# El ACK de un link state no depende del nodo: se serializa una sola vez
+_ACK_LSP = dumps({'tipo': 'ack_lsp'})
 
 class NodoLinkStateSimple:
     """Nodo Link State simple - igual que NodoRouter pero con Link State real"""
@@ -44,9 +48,15 @@ class NodoLinkStateSimple:
         # Socket y estado
         self.servidor_socket = None
         self.activo = True
-        self.puertos_nodos = {
-            'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
-            'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
+        self.servidor_listo = threading.Event()  # Se activa cuando el socket ya escucha
+        self.vecinos_recibidos = threading.Event()  # Se activa al tener el Link State de todos los vecinos
+        self.puertos_nodos = PUERTOS_NODOS
+        
+        # Tabla de despacho: tipo de mensaje -> manejador(mensaje, cliente)
+        self._manejadores = {
+            'lsp_update': self._manejar_lsp_update,
+            'ping_nodo': self._manejar_ping_nodo,
+            'envio_paquete': self.procesar_paquete_real,
         }
         
         # Inicializar con mi propia información
@@ -61,6 +71,7 @@ class NodoLinkStateSimple:
         try:
             self.servidor_socket.bind((self.host, self.puerto))
             self.servidor_socket.listen(5)
+            self.servidor_listo.set()
             print(f"\n🟢 NODO LINK STATE {self.nombre} ACTIVO en puerto {self.puerto}")
             
             while self.activo:
@@ -78,62 +89,17 @@ class NodoLinkStateSimple:
         """Maneja mensajes entrantes - igual que nodo_terminal.py pero con Link State"""
         try:
             cliente.settimeout(8)
-            data = cliente.recv(1024).decode()
+            data = cliente.recv(1024)
             
             if not data:
                 return
                 
-            mensaje = json.loads(data)
+            mensaje = loads(data)
             
-            if mensaje['tipo'] == 'lsp_update':
-                # Recibir actualización Link State
-                nodo_origen = mensaje['nodo']
-                vecinos_info = mensaje['vecinos']
-                
-                print(f"📡 Link State recibido de {nodo_origen}: {vecinos_info}")
-                
-                # Actualizar LSDB
-                self.lsdb[nodo_origen] = vecinos_info
-                
-                # Recalcular rutas
-                self.calcular_rutas()
-                
-                # Confirmar
-                respuesta = {'tipo': 'ack_lsp'}
-                cliente.send(json.dumps(respuesta).encode())
-                
-            elif mensaje['tipo'] == 'ping_nodo':
-                # Ping igual que en nodo_terminal.py
-                esperado = mensaje.get('esperando', 'desconocido')
-                desde = mensaje.get('desde', 'desconocido')
-                
-                print(f"   🏓 Ping recibido de {desde}, esperan nodo: {esperado}")
-                print(f"   🆔 Enviando identificación: {self.nombre}")
-                
-                respuesta_ping = {
-                    'tipo': 'pong_nodo',
-                    'nodo': self.nombre,
-                    'puerto': self.puerto,
-                    'timestamp': time.time()
-                }
-                
-                cliente.send(json.dumps(respuesta_ping).encode())
-                
-                # Esperar el paquete real
-                cliente.settimeout(8)
-                data_paquete = cliente.recv(1024).decode()
-                
-                if data_paquete:
-                    try:
-                        paquete_real = json.loads(data_paquete)
-                        if paquete_real.get('tipo') == 'envio_paquete':
-                            self.procesar_paquete_real(paquete_real, cliente)
-                    except Exception as e:
-                        print(f"   ❌ Error procesando paquete real: {e}")
-                        
-            elif mensaje['tipo'] == 'envio_paquete':
-                # Paquete directo
-                self.procesar_paquete_real(mensaje, cliente)
+            # Despachar según el tipo con una sola búsqueda en el diccionario
+            manejador = self._manejadores.get(mensaje['tipo'])
+            if manejador:
+                manejador(mensaje, cliente)
                 
         except Exception as e:
             print(f"❌ Error manejando cliente: {e}")
@@ -143,6 +109,55 @@ class NodoLinkStateSimple:
             except:
                 pass
                 
+    def _manejar_lsp_update(self, mensaje: dict, cliente):
+        """Recibe una actualización Link State de un vecino"""
+        nodo_origen = mensaje['nodo']
+        vecinos_info = mensaje['vecinos']
+        
+        print(f"📡 Link State recibido de {nodo_origen}: {vecinos_info}")
+        
+        # Actualizar LSDB
+        self.lsdb[nodo_origen] = vecinos_info
+        
+        # Recalcular rutas
+        self.calcular_rutas()
+        
+        # Avisar solo con la tabla ya recalculada: main la muestra al despertar
+        if self.vecinos_directos.keys() <= self.lsdb.keys():
+            self.vecinos_recibidos.set()
+        
+        # Confirmar
+        cliente.send(_ACK_LSP)
+        
+    def _manejar_ping_nodo(self, mensaje: dict, cliente):
+        """Ping igual que en nodo_terminal.py: responde y espera el paquete real"""
+        esperado = mensaje.get('esperando', 'desconocido')
+        desde = mensaje.get('desde', 'desconocido')
+        
+        print(f"   🏓 Ping recibido de {desde}, esperan nodo: {esperado}")
+        print(f"   🆔 Enviando identificación: {self.nombre}")
+        
+        respuesta_ping = {
+            'tipo': 'pong_nodo',
+            'nodo': self.nombre,
+            'puerto': self.puerto,
+            'timestamp': time.time()
+        }
+        
+        cliente.send(dumps(respuesta_ping))
+        
+        # Esperar el paquete real
+        cliente.settimeout(8)
+        data_paquete = cliente.recv(1024)
+        
+        if data_paquete:
+            try:
+                paquete_real = loads(data_paquete)
+                if paquete_real.get('tipo') == 'envio_paquete':
+                    self.procesar_paquete_real(paquete_real, cliente)
+            except Exception as e:
+                print(f"   ❌ Error procesando paquete real: {e}")
+                
     def procesar_paquete_real(self, paquete: dict, cliente):
         """Procesa paquetes - igual que nodo_terminal.py"""
         try:
@@ -168,7 +183,7 @@ class NodoLinkStateSimple:
                 print(f"   ✅ ENTREGADO EXITOSAMENTE AL DESTINO FINAL\n")
                 
                 respuesta = {'estado': 'entregado', 'nodo_receptor': self.nombre}
-                cliente.send(json.dumps(respuesta).encode())
+                cliente.send(dumps(respuesta))
                 
             else:
                 # Reenviar usando siguiente salto Link State
@@ -188,12 +203,12 @@ class NodoLinkStateSimple:
                     else:
                         print(f"   ❌ Error: No hay siguiente nodo en la ruta")
                         respuesta = {'estado': 'error', 'mensaje': 'Fin de ruta inesperado'}
-                        cliente.send(json.dumps(respuesta).encode())
+                        cliente.send(dumps(respuesta))
                         return
                 except ValueError:
                     print(f"   ❌ Error: Nodo {self.nombre} no encontrado en la ruta")
                     respuesta = {'estado': 'error', 'mensaje': 'Nodo no en ruta'}
-                    cliente.send(json.dumps(respuesta).encode())
+                    cliente.send(dumps(respuesta))
                     return
                 
                 print(f"   🚀 Reenviando a: {siguiente_nodo}")
@@ -205,12 +220,12 @@ class NodoLinkStateSimple:
                 self.reenviar_paquete(siguiente_nodo, paquete)
                 
                 respuesta = {'estado': 'reenviado', 'nodo_intermedio': self.nombre}
-                cliente.send(json.dumps(respuesta).encode())
+                cliente.send(dumps(respuesta))
                 
         except Exception as e:
             print(f"❌ Error procesando paquete real: {e}")
             respuesta = {'estado': 'error', 'mensaje': str(e)}
-            cliente.send(json.dumps(respuesta).encode())
+            cliente.send(dumps(respuesta))
             
     def reenviar_paquete(self, siguiente_nodo: str, paquete: dict):
         """Reenvía paquete - igual que nodo_terminal.py"""
@@ -229,23 +244,23 @@ class NodoLinkStateSimple:
                 'desde': self.nombre
             }
             
-            cliente.send(json.dumps(mensaje_ping).encode())
-            respuesta_ping = cliente.recv(1024).decode()
+            cliente.send(dumps(mensaje_ping))
+            respuesta_ping = cliente.recv(1024)
             
             if respuesta_ping:
-                ping_data = json.loads(respuesta_ping)
+                ping_data = loads(respuesta_ping)
                 nodo_real = ping_data.get('nodo', 'desconocido')
                 
                 if nodo_real == siguiente_nodo:
                     print(f"   ✅ Identificación correcta: {nodo_real}")
                     
                     # Enviar paquete real
-                    cliente.send(json.dumps(paquete).encode())
+                    cliente.send(dumps(paquete))
                     
                     # Esperar confirmación
-                    respuesta = cliente.recv(1024).decode()
+                    respuesta = cliente.recv(1024)
                     if respuesta:
-                        confirmacion = json.loads(respuesta)
+                        confirmacion = loads(respuesta)
                         print(f"   📨 Confirmación recibida: {confirmacion}")
                         
                         if confirmacion['estado'] == 'reenviado':
@@ -274,10 +289,11 @@ class NodoLinkStateSimple:
             if self.nombre in g.routers:
                 distancias, predecesores = dijkstra(g, self.nombre)
                 
-                # Construir tabla
-                self.routing_table = {}
+                # Construir la tabla aparte y publicarla entera al final, para
+                # que quien la lea mientras tanto nunca vea una tabla a medias
+                tabla = {}
                 for destino in g.routers:
-                    if destino != self.nombre and distancias[destino] != float('inf'):
+                    if destino != self.nombre and distancias[destino] != math.inf:
                         # Reconstruir ruta
                         ruta = []
                         actual = destino
@@ -288,11 +304,12 @@ class NodoLinkStateSimple:
                             actual = predecesores.get(actual)
                         ruta.reverse()
                         
-                        self.routing_table[destino] = {
+                        tabla[destino] = {
                             'distancia': distancias[destino],
                             'ruta': ruta
                         }
                         
+                self.routing_table = tabla
                 print(f"🧮 Tabla Link State actualizada: {len(self.routing_table)} destinos")
             else:
                 print(f"⚠️  Nodo {self.nombre} no encontrado en topología Link State")
@@ -307,24 +324,38 @@ class NodoLinkStateSimple:
             'nodo': self.nombre,
             'vecinos': self.vecinos_directos
         }
+        # Serializar una sola vez: el mismo mensaje va a todos los vecinos
+        datos_lsp = dumps(mensaje_lsp)
         
+        # Enviar a todos los vecinos en paralelo (un hilo por vecino)
+        hilos = []
         for vecino in self.vecinos_directos.keys():
             if vecino in self.puertos_nodos:
-                try:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                        sock.settimeout(3)
-                        sock.connect((self.host, self.puertos_nodos[vecino]))
-                        sock.send(json.dumps(mensaje_lsp).encode())
-                        
-                        # Esperar confirmación
-                        respuesta = sock.recv(1024).decode()
-                        if respuesta:
-                            ack = json.loads(respuesta)
-                            if ack.get('tipo') == 'ack_lsp':
-                                print(f"✅ Link State enviado a {vecino}")
-                except Exception as e:
-                    print(f"❌ Error enviando Link State a {vecino}: {e}")
-                    
+                hilo = threading.Thread(target=self.enviar_link_state_a_vecino, args=(vecino, datos_lsp), daemon=True)
+                hilo.start()
+                hilos.append(hilo)
+                
+        # Esperar a que terminen todos los envíos
+        for hilo in hilos:
+            hilo.join()
+            
+    def enviar_link_state_a_vecino(self, vecino: str, datos_lsp: bytes):
+        """Envía el mensaje Link State (ya serializado) a un vecino directo"""
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.settimeout(3)
+                sock.connect((self.host, self.puertos_nodos[vecino]))
+                sock.send(datos_lsp)
+                
+                # Esperar confirmación
+                respuesta = sock.recv(1024)
+                if respuesta:
+                    ack = loads(respuesta)
+                    if ack.get('tipo') == 'ack_lsp':
+                        print(f"✅ Link State enviado a {vecino}")
+        except Exception as e:
+            print(f"❌ Error enviando Link State a {vecino}: {e}")
+            
     def enviar_paquete(self, destino: str, mensaje: str = "Paquete Link State"):
         """Envía paquete usando rutas Link State"""
         if destino not in self.routing_table:
@@ -372,21 +403,21 @@ class NodoLinkStateSimple:
                 'desde': self.nombre
             }
             
-            cliente.send(json.dumps(mensaje_ping).encode())
-            respuesta_ping = cliente.recv(1024).decode()
+            cliente.send(dumps(mensaje_ping))
+            respuesta_ping = cliente.recv(1024)
             
             if respuesta_ping:
-                ping_data = json.loads(respuesta_ping)
+                ping_data = loads(respuesta_ping)
                 nodo_real = ping_data.get('nodo', 'desconocido')
                 
                 if nodo_real == primer_salto:
                     # Enviar paquete real
-                    cliente.send(json.dumps(paquete).encode())
+                    cliente.send(dumps(paquete))
                     
                     # Esperar confirmación
-                    respuesta = cliente.recv(1024).decode()
+                    respuesta = cliente.recv(1024)
                     if respuesta:
-                        confirmacion = json.loads(respuesta)
+                        confirmacion = loads(respuesta)
                         print(f"   ✅ Paquete Link State enviado: {confirmacion.get('estado', 'ok')}")
                         print(f"   🎯 El paquete seguirá la ruta Link State: {' -> '.join(ruta)}")
                         
@@ -482,30 +513,26 @@ def main():
         
     nombre = sys.argv[1].upper().strip()
     
-    puertos = {
-        'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
-        'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
-    }
-    
-    if nombre not in puertos:
+    if nombre not in PUERTOS_NODOS:
         print(f"❌ Nodo '{nombre}' no válido")
-        print("Nodos disponibles:", ", ".join(puertos.keys()))
+        print("Nodos disponibles:", ", ".join(PUERTOS_NODOS.keys()))
         sys.exit(1)
         
-    puerto = puertos[nombre]
+    puerto = PUERTOS_NODOS[nombre]
     nodo = NodoLinkStateSimple(nombre, puerto)
     
     # Iniciar servidor
     servidor_thread = threading.Thread(target=nodo.iniciar_servidor, daemon=True)
     servidor_thread.start()
     
-    time.sleep(1)
+    # Esperar a que el servidor esté escuchando (máximo 1 segundo)
+    nodo.servidor_listo.wait(timeout=1)
     
     # Propagar Link State inicial
     print("🚀 Propagando Link State inicial...")
     nodo.propagar_link_state()
     
-    time.sleep(2)  # Dar tiempo para recibir otros Link States
+    nodo.vecinos_recibidos.wait(timeout=2)  # Hasta recibir a todos los vecinos (máximo 2 segundos)
     
     # Mostrar tabla inicial
     nodo.mostrar_tabla_enrutamiento()
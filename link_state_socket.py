@@ -4,23 +4,29 @@ Cada nodo es un proceso independiente que se comunica con otros nodos via TCP
 """
 
 import socket
-import json
 import threading
 import time
 import sys
-import hashlib
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Set
-from dijkstra import dijkstra, first_hop
+from dijkstra import dijkstra, primeros_saltos
 from grafo import grafo
+from protocolo import PUERTOS_NODOS, dumps, loads, armar_frame, enviar_frame, recibir_frame
 
 class LSP:
     """Link State Packet para comunicación entre nodos"""
-    def __init__(self, source: str, sequence_num: int, age: int, neighbors: Dict[str, int]):
+    # Atributos fijos: sin __dict__ por instancia (hay un LSP por nodo en cada LSDB)
+    __slots__ = ('source', 'sequence_num', 'age', 'neighbors', 'timestamp')
+    
+    def __init__(self, source: str, sequence_num: int, age: int, neighbors: Dict[str, int],
+                 timestamp: Optional[float] = None):
         self.source = source
         self.sequence_num = sequence_num
         self.age = age
         self.neighbors = neighbors.copy()
-        self.timestamp = time.time()
+        self.timestamp = time.time() if timestamp is None else timestamp
         
     def to_dict(self) -> dict:
         return {
@@ -33,39 +39,66 @@ class LSP:
     
     @classmethod
     def from_dict(cls, data: dict):
-        lsp = cls(data['source'], data['sequence_num'], data['age'], data['neighbors'])
-        lsp.timestamp = data['timestamp']
-        return lsp
+        # Los nombres de nodo son un conjunto pequeño y fijo: se internan para que
+        # todas las LSDB y tablas compartan un único str por nodo en lugar de
+        # guardar una copia nueva por cada LSP parseado
+        vecinos = {sys.intern(v): costo for v, costo in data['neighbors'].items()}
+        return cls(sys.intern(data['source']), data['sequence_num'], data['age'], vecinos, data['timestamp'])
 
 class LinkStateSocketNode:
     """Nodo Link State que se comunica via sockets"""
     
-    def __init__(self, nombre: str, puerto: int, vecinos_iniciales: Dict[str, int], puertos_nodos: Dict[str, int]):
+    def __init__(self, nombre: str, puerto: int, vecinos_iniciales: Dict[str, int], puertos_nodos: Dict[str, int], verbose: bool = True):
         self.nombre = nombre
         self.puerto = puerto
         self.host = '127.0.0.1'
         self.vecinos = vecinos_iniciales.copy()
-        self.puertos_nodos = puertos_nodos.copy()
+        self.puertos_nodos = puertos_nodos
+        self.verbose = verbose  # Si es False no se imprime el detalle de cada LSP
         
         # Estado Link State
         self.sequence_num = 0
         self.lsdb = {}  # {source: LSP}
         self.routing_table = {}
         self.topology_version = 0
+        self._firma_tabla = None  # Estado de la LSDB con el que se calculó la tabla actual
         
         # Sockets y threading
         self.servidor_socket = None
         self.activo = True
+        self.detenido = threading.Event()  # Se activa al llamar a detener()
         self.lock = threading.RLock()
         
+        # Pools acotados: uno atiende conexiones entrantes y otro envía LSPs.
+        # Van separados para que los envíos que esperan ACK no ocupen los
+        # hilos que tienen que responder a los demás nodos.
+        self.pool_clientes = ThreadPoolExecutor(max_workers=16, thread_name_prefix=f"{nombre}-cliente")
+        self.pool_envios = ThreadPoolExecutor(max_workers=16, thread_name_prefix=f"{nombre}-envio")
+        
+        # Sockets en uso por los hilos de los pools. Esos hilos no son daemon y
+        # Python los espera al salir: detener() cierra estos sockets para
+        # desbloquearlos en lugar de esperar a que venza su timeout.
+        self._conexiones_abiertas = set()
+        self._lock_conexiones = threading.Lock()
+        
         # Para tracking de LSPs enviados recientemente (evitar loops)
-        self.lsp_cache = set()  # Set de hashes de LSPs enviados recientemente
+        self.lsp_cache = OrderedDict()  # {(source, seq, vecinos): None} en orden de llegada
         
         # Estadísticas
         self.lsps_enviados = 0
         self.lsps_recibidos = 0
         self.tablas_calculadas = 0
         
+        # El ACK de cada LSP es siempre el mismo: se serializa y enmarca una sola vez
+        self._frame_ack = armar_frame(dumps({'tipo': 'ack', 'nodo': self.nombre}))
+        
+        # Tabla de despacho: tipo de mensaje -> manejador(mensaje, cliente)
+        self._manejadores = {
+            'lsp_flood': self._manejar_lsp_flood,
+            'hello': self._manejar_hello,
+            'get_status': self._manejar_get_status,
+        }
+        
     def iniciar_servidor(self):
         """Inicia el servidor para recibir mensajes de otros nodos"""
         try:
@@ -78,7 +111,7 @@ class LinkStateSocketNode:
             while self.activo:
                 try:
                     cliente, direccion = self.servidor_socket.accept()
-                    threading.Thread(target=self.manejar_cliente, args=(cliente, direccion), daemon=True).start()
+                    self.pool_clientes.submit(self.manejar_cliente, cliente, direccion)
                 except Exception as e:
                     if self.activo:  # Solo mostrar error si no estamos cerrando
                         print(f"[{self.nombre}] Error aceptando conexión: {e}")
@@ -91,52 +124,106 @@ class LinkStateSocketNode:
                 
     def manejar_cliente(self, cliente, direccion):
         """Maneja mensajes entrantes de otros nodos"""
+        self._registrar_conexion(cliente)
         try:
+            # Una conexión que no envía nada no puede ocupar el hilo para siempre
+            cliente.settimeout(10.0)
+            # Los mensajes de control son pequeños: enviarlos sin esperar a Nagle
+            cliente.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
             # Recibir mensaje
-            data = cliente.recv(4096).decode('utf-8')
+            data = recibir_frame(cliente)
             if not data:
                 return
                 
-            mensaje = json.loads(data)
-            tipo = mensaje.get('tipo')
-            
-            if tipo == 'lsp_flood':
-                # Recibir LSP de otro nodo
-                lsp_data = mensaje['lsp']
-                lsp = LSP.from_dict(lsp_data)
-                self.procesar_lsp_recibido(lsp, mensaje.get('sender'))
-                
-                # Confirmar recepción
-                respuesta = {'tipo': 'ack', 'nodo': self.nombre}
-                cliente.send(json.dumps(respuesta).encode('utf-8'))
-                
-            elif tipo == 'hello':
-                # Mensaje de saludo para verificar conectividad
-                respuesta = {
-                    'tipo': 'hello_response',
-                    'nodo': self.nombre,
-                    'timestamp': time.time()
-                }
-                cliente.send(json.dumps(respuesta).encode('utf-8'))
+            # Todos los mensajes válidos son objetos JSON: descartar frames
+            # corruptos sin pasar por el parser ni por la excepción
+            if data[:1] != b'{':
+                print(f"[{self.nombre}] Frame inválido recibido de {direccion}, descartado")
+                return
                 
-            elif tipo == 'get_status':
-                # Solicitud de estado del nodo
-                estado = self.obtener_estado_completo()
-                respuesta = {
-                    'tipo': 'status_response',
-                    'nodo': self.nombre,
-                    'estado': estado
-                }
-                cliente.send(json.dumps(respuesta).encode('utf-8'))
+            mensaje = loads(data)
+            
+            # Despachar según el tipo con una sola búsqueda en el diccionario
+            manejador = self._manejadores.get(mensaje.get('tipo'))
+            if manejador:
+                manejador(mensaje, cliente)
                 
         except Exception as e:
-            print(f"[{self.nombre}] Error manejando cliente: {e}")
+            if self.activo:
+                print(f"[{self.nombre}] Error manejando cliente: {e}")
         finally:
+            self._liberar_conexion(cliente)
             try:
                 cliente.close()
             except:
                 pass
                 
+    def _registrar_conexion(self, sock):
+        """Anota un socket en uso (si el nodo ya se detuvo, lo corta de inmediato)"""
+        with self._lock_conexiones:
+            self._conexiones_abiertas.add(sock)
+        if not self.activo:
+            self._cortar_conexion(sock)
+            
+    def _liberar_conexion(self, sock):
+        """Quita un socket de los que están en uso"""
+        with self._lock_conexiones:
+            self._conexiones_abiertas.discard(sock)
+            
+    @staticmethod
+    def _cortar_conexion(sock):
+        """Corta un socket para que el recv/connect bloqueado en él termine ya"""
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+            
+    def _manejar_lsp_flood(self, mensaje: dict, cliente):
+        """Recibe un LSP de otro nodo y confirma la recepción"""
+        lsp_data = mensaje['lsp']
+        if self._lsp_conocido(lsp_data):
+            # Copia repetida del flooding: no hace falta reconstruir el LSP
+            with self.lock:
+                self.lsps_recibidos += 1
+        else:
+            lsp = LSP.from_dict(lsp_data)
+            self.procesar_lsp_recibido(lsp, mensaje.get('sender'))
+        
+        # Confirmar recepción
+        cliente.sendall(self._frame_ack)
+        
+    def _manejar_hello(self, mensaje: dict, cliente):
+        """Mensaje de saludo para verificar conectividad"""
+        respuesta = {
+            'tipo': 'hello_response',
+            'nodo': self.nombre,
+            'timestamp': time.time()
+        }
+        enviar_frame(cliente, dumps(respuesta))
+        
+    def _manejar_get_status(self, mensaje: dict, cliente):
+        """Solicitud de estado del nodo"""
+        estado = self.obtener_estado_completo()
+        respuesta = {
+            'tipo': 'status_response',
+            'nodo': self.nombre,
+            'estado': estado
+        }
+        enviar_frame(cliente, dumps(respuesta))
+        
+    def _lsp_conocido(self, lsp_data: dict) -> bool:
+        """Indica si un LSP recibido no aporta nada nuevo a la LSDB"""
+        with self.lock:
+            existente = self.lsdb.get(lsp_data['source'])
+            if existente is None:
+                return False
+                
+            seq = lsp_data['sequence_num']
+            if seq < existente.sequence_num:
+                return True
+            return seq == existente.sequence_num and lsp_data['neighbors'] == existente.neighbors
+            
     def generar_lsp(self) -> LSP:
         """Genera un nuevo LSP con la información local"""
         with self.lock:
@@ -158,7 +245,8 @@ class LinkStateSocketNode:
             if lsp.source == self.nombre:
                 return
                 
-            print(f"[{self.nombre}] Recibido LSP de {lsp.source} (seq: {lsp.sequence_num}) via {sender}")
+            if self.verbose:
+                print(f"[{self.nombre}] Recibido LSP de {lsp.source} (seq: {lsp.sequence_num}) via {sender}")
             
             # Verificar si es más reciente
             topology_changed = False
@@ -167,7 +255,8 @@ class LinkStateSocketNode:
                 # Nuevo nodo
                 self.lsdb[lsp.source] = lsp
                 topology_changed = True
-                print(f"[{self.nombre}] Nueva entrada LSDB para {lsp.source}")
+                if self.verbose:
+                    print(f"[{self.nombre}] Nueva entrada LSDB para {lsp.source}")
             else:
                 existing_lsp = self.lsdb[lsp.source]
                 
@@ -175,123 +264,159 @@ class LinkStateSocketNode:
                     # LSP más reciente
                     self.lsdb[lsp.source] = lsp
                     topology_changed = True
-                    print(f"[{self.nombre}] Actualizada LSDB para {lsp.source} (seq: {existing_lsp.sequence_num} -> {lsp.sequence_num})")
+                    if self.verbose:
+                        print(f"[{self.nombre}] Actualizada LSDB para {lsp.source} (seq: {existing_lsp.sequence_num} -> {lsp.sequence_num})")
                 elif lsp.sequence_num == existing_lsp.sequence_num and lsp.neighbors != existing_lsp.neighbors:
                     # Mismo número de secuencia pero contenido diferente
                     self.lsdb[lsp.source] = lsp
                     topology_changed = True
-                    print(f"[{self.nombre}] Contenido cambiado para {lsp.source}")
+                    if self.verbose:
+                        print(f"[{self.nombre}] Contenido cambiado para {lsp.source}")
                     
-            if topology_changed:
-                self.topology_version += 1
-                # Recalcular tabla de enrutamiento
-                self.calcular_tabla_enrutamiento()
-                # Retransmitir a vecinos (flooding)
-                self.retransmitir_lsp(lsp, sender)
+            if not topology_changed:
+                return
+            self.topology_version += 1
+            
+        # Fuera del lock: Dijkstra y el flooding no deben frenar a otros hilos
+        # que solo necesitan actualizar la LSDB o responder un get_status
+        self.calcular_tabla_enrutamiento()
+        self.retransmitir_lsp(lsp, sender)
                 
     def retransmitir_lsp(self, lsp: LSP, sender: str = None):
         """Retransmite un LSP a todos los vecinos excepto al sender"""
-        lsp_hash = hashlib.md5(json.dumps(lsp.to_dict(), sort_keys=True).encode()).hexdigest()
+        # Identidad del LSP: origen, secuencia y contenido (sin serializar ni hashear)
+        lsp_id = (lsp.source, lsp.sequence_num, tuple(sorted(lsp.neighbors.items())))
         
-        # Evitar retransmisiones duplicadas recientes
-        if lsp_hash in self.lsp_cache:
-            return
-            
-        self.lsp_cache.add(lsp_hash)
-        
-        # Limpiar cache viejo (mantener solo últimos 100)
-        if len(self.lsp_cache) > 100:
-            self.lsp_cache.clear()
+        with self.lock:
+            # Evitar retransmisiones duplicadas recientes
+            if lsp_id in self.lsp_cache:
+                return
+                
+            self.lsp_cache[lsp_id] = None
             
-        vecinos_a_enviar = []
-        for vecino in self.vecinos.keys():
-            if vecino != sender and vecino in self.puertos_nodos:
-                vecinos_a_enviar.append(vecino)
+            # Mantener solo los últimos 100: se descarta el más antiguo, no todo el cache
+            if len(self.lsp_cache) > 100:
+                self.lsp_cache.popitem(last=False)
+                
+            vecinos_a_enviar = []
+            for vecino in self.vecinos.keys():
+                if vecino != sender and vecino in self.puertos_nodos:
+                    vecinos_a_enviar.append(vecino)
                 
         if vecinos_a_enviar:
-            print(f"[{self.nombre}] Retransmitiendo LSP de {lsp.source} a: {vecinos_a_enviar}")
+            if self.verbose:
+                print(f"[{self.nombre}] Retransmitiendo LSP de {lsp.source} a: {vecinos_a_enviar}")
+            frame = self._serializar_lsp(lsp)
             for vecino in vecinos_a_enviar:
-                threading.Thread(target=self.enviar_lsp_a_nodo, args=(lsp, vecino), daemon=True).start()
+                self.pool_envios.submit(self.enviar_lsp_a_nodo, frame, vecino)
                 
-    def enviar_lsp_a_nodo(self, lsp: LSP, destino: str):
-        """Envía un LSP a un nodo específico"""
+    def _serializar_lsp(self, lsp: LSP) -> bytes:
+        """Arma el frame de flooding (longitud + JSON) una sola vez para todos los vecinos"""
+        mensaje = {
+            'tipo': 'lsp_flood',
+            'sender': self.nombre,
+            'lsp': lsp.to_dict()
+        }
+        return armar_frame(dumps(mensaje))
+        
+    def enviar_lsp_a_nodo(self, frame: bytes, destino: str):
+        """Envía un LSP ya enmarcado a un nodo específico (un solo sendall)"""
         if destino not in self.puertos_nodos:
             return
             
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(5.0)  # Timeout de 5 segundos
-                sock.connect((self.host, self.puertos_nodos[destino]))
-                
-                mensaje = {
-                    'tipo': 'lsp_flood',
-                    'sender': self.nombre,
-                    'lsp': lsp.to_dict()
-                }
-                
-                sock.send(json.dumps(mensaje).encode('utf-8'))
-                
-                # Esperar confirmación
-                respuesta = sock.recv(1024).decode('utf-8')
-                if respuesta:
-                    ack = json.loads(respuesta)
-                    if ack.get('tipo') == 'ack':
-                        self.lsps_enviados += 1
+                self._registrar_conexion(sock)
+                try:
+                    sock.settimeout(5.0)  # Timeout de 5 segundos
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    sock.connect((self.host, self.puertos_nodos[destino]))
+                    
+                    sock.sendall(frame)
+                    
+                    # Esperar confirmación
+                    respuesta = recibir_frame(sock)
+                    if respuesta:
+                        ack = loads(respuesta)
+                        if ack.get('tipo') == 'ack':
+                            self.lsps_enviados += 1
+                finally:
+                    self._liberar_conexion(sock)
                         
         except Exception as e:
-            print(f"[{self.nombre}] Error enviando LSP a {destino}: {e}")
+            if self.activo:
+                print(f"[{self.nombre}] Error enviando LSP a {destino}: {e}")
             
     def calcular_tabla_enrutamiento(self):
         """Calcula la tabla de enrutamiento usando Dijkstra sobre la LSDB"""
         with self.lock:
-            print(f"[{self.nombre}] Recalculando tabla de enrutamiento (versión {self.topology_version})")
+            # Todo cambio en la LSDB sube topology_version (LSPs ajenos) o
+            # sequence_num (LSP propio): si ninguno cambió, la tabla sigue vigente
+            firma = (self.topology_version, self.sequence_num)
+            if firma == self._firma_tabla:
+                return
+            self._firma_tabla = firma
             self.tablas_calculadas += 1
             
-            # Construir grafo desde LSDB
-            grafo_topologia = grafo()
+            # Los LSPs se reemplazan, nunca se modifican: basta copiar la lista
+            # y el cálculo puede hacerse fuera del lock
+            lsps = list(self.lsdb.values())
             
-            for source, lsp in self.lsdb.items():
-                for neighbor, cost in lsp.neighbors.items():
-                    grafo_topologia.agregar_conexion(source, neighbor, cost, bidireccional=False)
-                    
-            # Verificar que estemos en la topología
-            if self.nombre not in grafo_topologia.routers:
-                print(f"[{self.nombre}] ERROR: Nodo no encontrado en topología construida")
-                return
-                
-            # Calcular rutas más cortas
-            try:
-                distances, predecessors = dijkstra(grafo_topologia, self.nombre)
-                
-                # Construir tabla de enrutamiento
-                nueva_tabla = {}
+        if self.verbose:
+            print(f"[{self.nombre}] Recalculando tabla de enrutamiento (versión {firma[0]})")
+            
+        # Construir grafo desde LSDB
+        grafo_topologia = grafo()
+        
+        for lsp in lsps:
+            for neighbor, cost in lsp.neighbors.items():
+                grafo_topologia.agregar_conexion(lsp.source, neighbor, cost, bidireccional=False)
                 
-                for dest in grafo_topologia.routers:
-                    if dest == self.nombre:
-                        continue
-                        
-                    distance = distances[dest]
-                    if distance == float('inf'):
-                        continue
-                        
-                    next_hop = first_hop(self.nombre, dest, predecessors)
-                    if next_hop:
-                        nueva_tabla[dest] = {
-                            'next_hop': next_hop,
-                            'distance': distance,
-                            'path': self._reconstruir_ruta(dest, predecessors)
-                        }
-                        
+        # Verificar que estemos en la topología
+        if self.nombre not in grafo_topologia.routers:
+            print(f"[{self.nombre}] ERROR: Nodo no encontrado en topología construida")
+            return
+            
+        # Calcular rutas más cortas
+        try:
+            distances, predecessors = dijkstra(grafo_topologia, self.nombre)
+            
+            # Construir tabla de enrutamiento
+            nueva_tabla = {}
+            saltos = primeros_saltos(self.nombre, predecessors)
+            
+            for dest in grafo_topologia.routers:
+                if dest == self.nombre:
+                    continue
+                    
+                distance = distances[dest]
+                if distance == math.inf:
+                    continue
+                    
+                next_hop = saltos.get(dest)
+                if next_hop:
+                    nueva_tabla[dest] = {
+                        'next_hop': next_hop,
+                        'distance': distance,
+                        'path': self._reconstruir_ruta(dest, predecessors)
+                    }
+                    
+            with self.lock:
+                # Si mientras tanto empezó un cálculo con una LSDB más nueva,
+                # este resultado ya está viejo y no debe pisar al otro
+                if firma != self._firma_tabla:
+                    return
+                    
                 # Detectar cambios en la tabla
                 cambios = self._detectar_cambios_tabla(nueva_tabla)
                 self.routing_table = nueva_tabla
                 
-                if cambios:
-                    print(f"[{self.nombre}] Tabla de enrutamiento actualizada:")
-                    self.imprimir_tabla_enrutamiento()
-                    
-            except Exception as e:
-                print(f"[{self.nombre}] Error calculando tabla de enrutamiento: {e}")
+            if cambios and self.verbose:
+                print(f"[{self.nombre}] Tabla de enrutamiento actualizada:")
+                self.imprimir_tabla_enrutamiento()
+                
+        except Exception as e:
+            print(f"[{self.nombre}] Error calculando tabla de enrutamiento: {e}")
                 
     def _reconstruir_ruta(self, dest: str, predecessors: Dict[str, Optional[str]]) -> List[str]:
         """Reconstruye la ruta completa hacia un destino"""
@@ -370,8 +495,9 @@ class LinkStateSocketNode:
         
         if vecinos_destino:
             print(f"[{self.nombre}] Propagando LSP inicial a vecinos: {vecinos_destino}")
+            frame = self._serializar_lsp(lsp)
             for vecino in vecinos_destino:
-                threading.Thread(target=self.enviar_lsp_a_nodo, args=(lsp, vecino), daemon=True).start()
+                self.pool_envios.submit(self.enviar_lsp_a_nodo, frame, vecino)
                 
     def imprimir_tabla_enrutamiento(self):
         """Imprime la tabla de enrutamiento actual"""
@@ -385,7 +511,7 @@ class LinkStateSocketNode:
             for dest in sorted(self.routing_table.keys()):
                 info = self.routing_table[dest]
                 path_str = " -> ".join(info['path'])
-                distance_str = str(int(info['distance'])) if info['distance'] != float('inf') else "∞"
+                distance_str = str(int(info['distance'])) if info['distance'] != math.inf else "∞"
                 
                 print(f"{dest:7} | {info['next_hop']:8} | {distance_str:9} | {path_str}")
         
@@ -426,21 +552,31 @@ class LinkStateSocketNode:
         """Detiene el nodo"""
         print(f"[{self.nombre}] Deteniendo nodo...")
         self.activo = False
+        self.detenido.set()
         if self.servidor_socket:
             try:
                 self.servidor_socket.close()
             except:
                 pass
+        # Descartar el trabajo en cola y desbloquear los hilos que esperan en un
+        # socket: así la salida del intérprete no queda esperando sus timeouts
+        self.pool_clientes.shutdown(wait=False, cancel_futures=True)
+        self.pool_envios.shutdown(wait=False, cancel_futures=True)
+        with self._lock_conexiones:
+            abiertas = list(self._conexiones_abiertas)
+        for sock in abiertas:
+            self._cortar_conexion(sock)
                 
 def main():
     """Función principal para ejecutar un nodo Link State"""
     if len(sys.argv) < 3:
-        print("Uso: python link_state_socket.py <nombre> <puerto>")
+        print("Uso: python link_state_socket.py <nombre> <puerto> [--silencioso]")
         print("Ejemplo: python link_state_socket.py A 65001")
         sys.exit(1)
         
     nombre = sys.argv[1].upper()
     puerto = int(sys.argv[2])
+    verbose = '--silencioso' not in sys.argv[3:]
     
     # Configuración de la red (misma topología que dijkstra.py)
     topologia = {
@@ -455,12 +591,6 @@ def main():
         "I": {"A": 1, "D": 6}
     }
     
-    # Puertos por defecto
-    puertos_nodos = {
-        'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
-        'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
-    }
-    
     if nombre not in topologia:
         print(f"Error: Nodo {nombre} no está en la topología")
         print(f"Nodos disponibles: {list(topologia.keys())}")
@@ -468,7 +598,7 @@ def main():
         
     # Crear y iniciar nodo
     vecinos_iniciales = topologia[nombre]
-    nodo = LinkStateSocketNode(nombre, puerto, vecinos_iniciales, puertos_nodos)
+    nodo = LinkStateSocketNode(nombre, puerto, vecinos_iniciales, PUERTOS_NODOS, verbose)
     
     # Iniciar servidor en hilo separado
     servidor_thread = threading.Thread(target=nodo.iniciar_servidor, daemon=True)
@@ -487,10 +617,11 @@ def main():
     print(f"[{nombre}] Nodo Link State iniciado correctamente")
     nodo.imprimir_tabla_enrutamiento()
     
-    # Loop principal
+    # Loop principal: despierta en cuanto se detiene el nodo. El timeout solo
+    # está para que Ctrl+C se atienda también en Windows durante la espera
     try:
-        while nodo.activo:
-            time.sleep(1)
+        while not nodo.detenido.wait(timeout=1):
+            pass
     except KeyboardInterrupt:
         print(f"\n[{nombre}] Recibido Ctrl+C")
     finally:
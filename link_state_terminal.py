@@ -4,22 +4,28 @@ Similar a nodo_terminal.py pero usando Link State distribuido
 """
 
 import socket
-import json
 import threading
 import time
 import sys
+import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-from dijkstra import dijkstra, first_hop
+from dijkstra import dijkstra, primeros_saltos
 from grafo import grafo
+from protocolo import PUERTOS_NODOS, dumps, loads, armar_frame, enviar_frame, recibir_frame
 
 class LSP:
     """Link State Packet"""
-    def __init__(self, source: str, sequence_num: int, age: int, neighbors: Dict[str, int]):
+    # Atributos fijos: sin __dict__ por instancia (hay un LSP por nodo en cada LSDB)
+    __slots__ = ('source', 'sequence_num', 'age', 'neighbors', 'timestamp')
+    
+    def __init__(self, source: str, sequence_num: int, age: int, neighbors: Dict[str, int],
+                 timestamp: Optional[float] = None):
         self.source = source
         self.sequence_num = sequence_num
         self.age = age
         self.neighbors = neighbors.copy()
-        self.timestamp = time.time()
+        self.timestamp = time.time() if timestamp is None else timestamp
         
     def to_dict(self) -> dict:
         return {
@@ -32,17 +38,20 @@ class LSP:
     
     @classmethod
     def from_dict(cls, data: dict):
-        lsp = cls(data['source'], data['sequence_num'], data['age'], data['neighbors'])
-        lsp.timestamp = data['timestamp']
-        return lsp
+        # Los nombres de nodo son un conjunto pequeño y fijo: se internan para que
+        # todas las LSDB y tablas compartan un único str por nodo en lugar de
+        # guardar una copia nueva por cada LSP parseado
+        vecinos = {sys.intern(v): costo for v, costo in data['neighbors'].items()}
+        return cls(sys.intern(data['source']), data['sequence_num'], data['age'], vecinos, data['timestamp'])
 
 class LinkStateTerminal:
     """Nodo Link State interactivo para terminal"""
     
-    def __init__(self, nombre: str, puerto: int):
+    def __init__(self, nombre: str, puerto: int, verbose: bool = True):
         self.nombre = nombre
         self.puerto = puerto
         self.host = '127.0.0.1'
+        self.verbose = verbose  # Si es False no se imprime el detalle de cada LSP ni de cada reenvío
         
         # Topología inicial
         self.topologia_inicial = {
@@ -64,17 +73,27 @@ class LinkStateTerminal:
         self.lsdb = {}  # {source: LSP}
         self.routing_table = {}
         self.topology_version = 0
+        self._firma_tabla = None  # Estado de la LSDB con el que se calculó la tabla actual
         
         # Sockets y threading
         self.servidor_socket = None
         self.activo = True
         self.lock = threading.RLock()
+        self.servidor_listo = threading.Event()  # Se activa cuando el socket ya escucha
+        self.lsdb_completa = threading.Event()  # Se activa al tener el LSP de todos los nodos
+        
+        # Hilos reutilizables para atender conexiones y para el flooding,
+        # separados para que los envíos que esperan ACK no bloqueen las respuestas
+        self.pool_conexiones = ThreadPoolExecutor(max_workers=16, thread_name_prefix=f"{nombre}-conexion")
+        self.pool_envios = ThreadPoolExecutor(max_workers=16, thread_name_prefix=f"{nombre}-envio")
+        
+        # Sockets en uso por los hilos de los pools: al detener el nodo se cortan
+        # para que la salida no espere a que venzan sus timeouts
+        self._conexiones_abiertas = set()
+        self._lock_conexiones = threading.Lock()
         
         # Puertos de otros nodos
-        self.puertos_nodos = {
-            'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
-            'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
-        }
+        self.puertos_nodos = PUERTOS_NODOS
         
         # Estadísticas
         self.lsps_enviados = 0
@@ -82,6 +101,17 @@ class LinkStateTerminal:
         self.mensajes_enviados = 0
         self.mensajes_recibidos = 0
         
+        # El ACK de cada LSP es siempre el mismo: se serializa y enmarca una sola vez
+        self._frame_ack = armar_frame(dumps({'tipo': 'ack_lsp', 'nodo': self.nombre}))
+        
+        # Tabla de despacho: tipo de mensaje -> manejador(mensaje, cliente)
+        self._manejadores = {
+            'lsp_flood': self._manejar_lsp_flood,
+            'mensaje_usuario': self.procesar_mensaje_usuario,
+            'ping': self._manejar_ping,
+            'get_estado': self._manejar_get_estado,
+        }
+        
     def iniciar_servidor(self):
         """Inicia el servidor para recibir LSPs y mensajes"""
         self.servidor_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -90,12 +120,13 @@ class LinkStateTerminal:
         try:
             self.servidor_socket.bind((self.host, self.puerto))
             self.servidor_socket.listen(10)
+            self.servidor_listo.set()
             print(f"🟢 NODO LINK STATE {self.nombre} ACTIVO en puerto {self.puerto}")
             
             while self.activo:
                 try:
                     cliente, direccion = self.servidor_socket.accept()
-                    threading.Thread(target=self.manejar_conexion, args=(cliente, direccion), daemon=True).start()
+                    self.pool_conexiones.submit(self.manejar_conexion, cliente, direccion)
                 except:
                     if self.activo:
                         break
@@ -105,50 +136,89 @@ class LinkStateTerminal:
             
     def manejar_conexion(self, cliente, direccion):
         """Maneja conexiones entrantes"""
+        self._registrar_conexion(cliente)
         try:
             cliente.settimeout(10.0)
-            data = cliente.recv(4096).decode('utf-8')
+            data = recibir_frame(cliente)
             
             if not data:
                 return
                 
-            mensaje = json.loads(data)
-            tipo = mensaje.get('tipo')
+            mensaje = loads(data)
             
-            if tipo == 'lsp_flood':
-                # Recibir LSP
-                lsp_data = mensaje['lsp']
-                lsp = LSP.from_dict(lsp_data)
-                sender = mensaje.get('sender')
-                self.procesar_lsp(lsp, sender)
-                
-                # Confirmar recepción
-                respuesta = {'tipo': 'ack_lsp', 'nodo': self.nombre}
-                cliente.send(json.dumps(respuesta).encode('utf-8'))
-                
-            elif tipo == 'mensaje_usuario':
-                # Recibir mensaje de usuario (como los paquetes en Dijkstra)
-                self.procesar_mensaje_usuario(mensaje, cliente)
-                
-            elif tipo == 'ping':
-                # Ping de conectividad
-                respuesta = {'tipo': 'pong', 'nodo': self.nombre, 'timestamp': time.time()}
-                cliente.send(json.dumps(respuesta).encode('utf-8'))
-                
-            elif tipo == 'get_estado':
-                # Solicitud de estado
-                estado = self.obtener_estado()
-                respuesta = {'tipo': 'estado', 'datos': estado}
-                cliente.send(json.dumps(respuesta).encode('utf-8'))
+            # Despachar según el tipo con una sola búsqueda en el diccionario
+            manejador = self._manejadores.get(mensaje.get('tipo'))
+            if manejador:
+                manejador(mensaje, cliente)
                 
         except Exception as e:
-            print(f"❌ Error manejando conexión: {e}")
+            if self.activo:
+                print(f"❌ Error manejando conexión: {e}")
         finally:
+            self._liberar_conexion(cliente)
             try:
                 cliente.close()
             except:
                 pass
                 
+    def _registrar_conexion(self, sock):
+        """Anota un socket en uso (si el nodo ya se detuvo, lo corta de inmediato)"""
+        with self._lock_conexiones:
+            self._conexiones_abiertas.add(sock)
+        if not self.activo:
+            self._cortar_conexion(sock)
+            
+    def _liberar_conexion(self, sock):
+        """Quita un socket de los que están en uso"""
+        with self._lock_conexiones:
+            self._conexiones_abiertas.discard(sock)
+            
+    @staticmethod
+    def _cortar_conexion(sock):
+        """Corta un socket para que el recv/connect bloqueado en él termine ya"""
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+                
+    def _manejar_lsp_flood(self, mensaje: dict, cliente):
+        """Recibe un LSP y confirma la recepción"""
+        lsp_data = mensaje['lsp']
+        if self._lsp_conocido(lsp_data):
+            # Copia repetida del flooding: no hace falta reconstruir el LSP
+            with self.lock:
+                self.lsps_recibidos += 1
+        else:
+            lsp = LSP.from_dict(lsp_data)
+            sender = mensaje.get('sender')
+            self.procesar_lsp(lsp, sender)
+        
+        # Confirmar recepción
+        cliente.sendall(self._frame_ack)
+        
+    def _manejar_ping(self, mensaje: dict, cliente):
+        """Ping de conectividad"""
+        respuesta = {'tipo': 'pong', 'nodo': self.nombre, 'timestamp': time.time()}
+        enviar_frame(cliente, dumps(respuesta))
+        
+    def _manejar_get_estado(self, mensaje: dict, cliente):
+        """Solicitud de estado"""
+        estado = self.obtener_estado()
+        respuesta = {'tipo': 'estado', 'datos': estado}
+        enviar_frame(cliente, dumps(respuesta))
+        
+    def _lsp_conocido(self, lsp_data: dict) -> bool:
+        """Indica si un LSP recibido no aporta nada nuevo a la LSDB"""
+        with self.lock:
+            existente = self.lsdb.get(lsp_data['source'])
+            if existente is None:
+                return False
+                
+            seq = lsp_data['sequence_num']
+            if seq < existente.sequence_num:
+                return True
+            return seq == existente.sequence_num and lsp_data['neighbors'] == existente.neighbors
+            
     def procesar_lsp(self, lsp: LSP, sender: str = None):
         """Procesa un LSP recibido"""
         with self.lock:
@@ -158,7 +228,8 @@ class LinkStateTerminal:
             if lsp.source == self.nombre:
                 return
                 
-            print(f"📡 LSP recibido de {lsp.source} (seq: {lsp.sequence_num}) vía {sender}")
+            if self.verbose:
+                print(f"📡 LSP recibido de {lsp.source} (seq: {lsp.sequence_num}) vía {sender}")
             
             topology_changed = False
             
@@ -166,7 +237,8 @@ class LinkStateTerminal:
                 # Nuevo nodo
                 self.lsdb[lsp.source] = lsp
                 topology_changed = True
-                print(f"   ➕ Nuevo nodo en LSDB: {lsp.source}")
+                if self.verbose:
+                    print(f"   ➕ Nuevo nodo en LSDB: {lsp.source}")
             else:
                 existing_lsp = self.lsdb[lsp.source]
                 
@@ -174,16 +246,19 @@ class LinkStateTerminal:
                     # LSP más reciente
                     self.lsdb[lsp.source] = lsp
                     topology_changed = True
-                    print(f"   🔄 LSDB actualizada para {lsp.source} (seq: {existing_lsp.sequence_num} -> {lsp.sequence_num})")
+                    if self.verbose:
+                        print(f"   🔄 LSDB actualizada para {lsp.source} (seq: {existing_lsp.sequence_num} -> {lsp.sequence_num})")
                 elif lsp.sequence_num == existing_lsp.sequence_num and lsp.neighbors != existing_lsp.neighbors:
                     # Mismo número de secuencia pero contenido diferente
                     self.lsdb[lsp.source] = lsp
                     topology_changed = True
-                    print(f"   📝 Contenido cambiado para {lsp.source}")
+                    if self.verbose:
+                        print(f"   📝 Contenido cambiado para {lsp.source}")
                     
             if topology_changed:
                 self.topology_version += 1
-                print(f"   🔥 TOPOLOGÍA CAMBIÓ - Recalculando rutas...")
+                if self.verbose:
+                    print(f"   🔥 TOPOLOGÍA CAMBIÓ - Recalculando rutas...")
                 self.calcular_tabla_enrutamiento()
                 # Retransmitir a otros vecinos
                 self.retransmitir_lsp(lsp, sender)
@@ -212,50 +287,60 @@ class LinkStateTerminal:
                 print(f"   ✅ ENTREGADO AL DESTINO FINAL\n")
                 
                 respuesta = {'estado': 'entregado', 'nodo': self.nombre}
-                cliente.send(json.dumps(respuesta).encode())
+                enviar_frame(cliente, dumps(respuesta))
                 
             else:
                 # Reenviar mensaje
-                print(f"🔄 Mensaje en tránsito: {origen} -> {destino} (pasando por {self.nombre})")
+                if self.verbose:
+                    print(f"🔄 Mensaje en tránsito: {origen} -> {destino} (pasando por {self.nombre})")
                 
                 # Encontrar siguiente salto usando nuestra tabla Link State
                 if destino in self.routing_table:
                     siguiente_nodo = self.routing_table[destino]['next_hop']
-                    print(f"   🚀 Reenviando a: {siguiente_nodo}")
+                    if self.verbose:
+                        print(f"   🚀 Reenviando a: {siguiente_nodo}")
+                    
+                    # Confirmar antes de reenviar: la respuesta no depende del resto
+                    # del camino, así el nodo anterior no espera a toda la cadena
+                    respuesta = {'estado': 'reenviado', 'via': siguiente_nodo}
+                    enviar_frame(cliente, dumps(respuesta))
                     
                     mensaje['saltos_recorridos'] = saltos_recorridos
                     self.reenviar_mensaje(siguiente_nodo, mensaje)
-                    
-                    respuesta = {'estado': 'reenviado', 'via': siguiente_nodo}
-                    cliente.send(json.dumps(respuesta).encode())
                 else:
                     print(f"   ❌ No hay ruta hacia {destino}")
                     respuesta = {'estado': 'sin_ruta', 'destino': destino}
-                    cliente.send(json.dumps(respuesta).encode())
+                    enviar_frame(cliente, dumps(respuesta))
                     
         except Exception as e:
             print(f"❌ Error procesando mensaje: {e}")
             respuesta = {'estado': 'error', 'mensaje': str(e)}
-            cliente.send(json.dumps(respuesta).encode())
+            enviar_frame(cliente, dumps(respuesta))
             
     def reenviar_mensaje(self, siguiente_nodo: str, mensaje: dict):
         """Reenvía un mensaje al siguiente nodo"""
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(5.0)
-                sock.connect((self.host, self.puertos_nodos[siguiente_nodo]))
-                
-                mensaje['tipo'] = 'mensaje_usuario'
-                sock.send(json.dumps(mensaje).encode('utf-8'))
-                
-                # Esperar confirmación
-                respuesta = sock.recv(1024).decode('utf-8')
-                if respuesta:
-                    confirmacion = json.loads(respuesta)
-                    print(f"   ✅ Mensaje reenviado a {siguiente_nodo}: {confirmacion.get('estado', 'ok')}")
+                self._registrar_conexion(sock)
+                try:
+                    sock.settimeout(5.0)
+                    sock.connect((self.host, self.puertos_nodos[siguiente_nodo]))
+                    
+                    mensaje['tipo'] = 'mensaje_usuario'
+                    enviar_frame(sock, dumps(mensaje))
+                    
+                    # Esperar confirmación
+                    respuesta = recibir_frame(sock)
+                    if respuesta:
+                        confirmacion = loads(respuesta)
+                        if self.verbose:
+                            print(f"   ✅ Mensaje reenviado a {siguiente_nodo}: {confirmacion.get('estado', 'ok')}")
+                finally:
+                    self._liberar_conexion(sock)
                     
         except Exception as e:
-            print(f"   ❌ Error reenviando a {siguiente_nodo}: {e}")
+            if self.activo:
+                print(f"   ❌ Error reenviando a {siguiente_nodo}: {e}")
             
     def generar_lsp(self) -> LSP:
         """Genera un nuevo LSP"""
@@ -263,53 +348,77 @@ class LinkStateTerminal:
             self.sequence_num += 1
             lsp = LSP(self.nombre, self.sequence_num, 0, self.vecinos)
             
-            # Actualizar nuestra LSDB
+            # Actualizar nuestra LSDB (puede ser el LSP que faltaba para completarla;
+            # lsdb_completa se activa al recalcular la tabla)
             self.lsdb[self.nombre] = lsp
             
             print(f"📋 LSP #{self.sequence_num} generado con vecinos: {self.vecinos}")
             return lsp
             
+    def _verificar_lsdb_completa(self):
+        """Activa lsdb_completa si ya hay un LSP de cada nodo (llamar con el lock tomado)"""
+        if len(self.lsdb) >= len(self.topologia_inicial):
+            self.lsdb_completa.set()
+            
     def propagar_lsp(self, lsp: LSP):
         """Propaga un LSP a todos los vecinos"""
+        frame = self._serializar_lsp(lsp)
         for vecino in self.vecinos.keys():
             if vecino in self.puertos_nodos:
-                threading.Thread(target=self.enviar_lsp_a_nodo, args=(lsp, vecino), daemon=True).start()
+                self.pool_envios.submit(self.enviar_lsp_a_nodo, frame, vecino)
                 
     def retransmitir_lsp(self, lsp: LSP, sender: str = None):
         """Retransmite un LSP a vecinos (excepto sender)"""
+        frame = self._serializar_lsp(lsp)
         for vecino in self.vecinos.keys():
             if vecino != sender and vecino in self.puertos_nodos:
-                threading.Thread(target=self.enviar_lsp_a_nodo, args=(lsp, vecino), daemon=True).start()
+                self.pool_envios.submit(self.enviar_lsp_a_nodo, frame, vecino)
                 
-    def enviar_lsp_a_nodo(self, lsp: LSP, destino: str):
-        """Envía un LSP a un nodo específico"""
+    def _serializar_lsp(self, lsp: LSP) -> bytes:
+        """Serializa y enmarca el mensaje de flooding una sola vez para todos los vecinos"""
+        return armar_frame(dumps({
+            'tipo': 'lsp_flood',
+            'sender': self.nombre,
+            'lsp': lsp.to_dict()
+        }))
+                
+    def enviar_lsp_a_nodo(self, frame: bytes, destino: str):
+        """Envía un LSP ya serializado y enmarcado a un nodo específico"""
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(3.0)
-                sock.connect((self.host, self.puertos_nodos[destino]))
-                
-                mensaje = {
-                    'tipo': 'lsp_flood',
-                    'sender': self.nombre,
-                    'lsp': lsp.to_dict()
-                }
-                
-                sock.send(json.dumps(mensaje).encode('utf-8'))
-                
-                # Esperar ACK
-                respuesta = sock.recv(1024).decode('utf-8')
-                if respuesta:
-                    ack = json.loads(respuesta)
-                    if ack.get('tipo') == 'ack_lsp':
-                        self.lsps_enviados += 1
+                self._registrar_conexion(sock)
+                try:
+                    sock.settimeout(3.0)
+                    sock.connect((self.host, self.puertos_nodos[destino]))
+                    
+                    sock.sendall(frame)
+                    
+                    # Esperar ACK
+                    respuesta = recibir_frame(sock)
+                    if respuesta:
+                        ack = loads(respuesta)
+                        if ack.get('tipo') == 'ack_lsp':
+                            self.lsps_enviados += 1
+                finally:
+                    self._liberar_conexion(sock)
                         
         except Exception as e:
-            print(f"❌ Error enviando LSP a {destino}: {e}")
+            if self.activo:
+                print(f"❌ Error enviando LSP a {destino}: {e}")
             
     def calcular_tabla_enrutamiento(self):
         """Calcula tabla de enrutamiento usando Dijkstra sobre LSDB"""
         with self.lock:
-            print(f"🧮 Recalculando tabla de enrutamiento...")
+            # Todo cambio en la LSDB sube topology_version (LSPs ajenos) o
+            # sequence_num (LSP propio): si ninguno cambió, la tabla sigue vigente
+            firma = (self.topology_version, self.sequence_num)
+            if firma == self._firma_tabla:
+                self._verificar_lsdb_completa()
+                return
+            self._firma_tabla = firma
+            
+            if self.verbose:
+                print(f"🧮 Recalculando tabla de enrutamiento...")
             
             # Construir grafo desde LSDB
             grafo_topologia = grafo()
@@ -326,15 +435,16 @@ class LinkStateTerminal:
                 distances, predecessors = dijkstra(grafo_topologia, self.nombre)
                 
                 nueva_tabla = {}
+                saltos = primeros_saltos(self.nombre, predecessors)
                 for dest in grafo_topologia.routers:
                     if dest == self.nombre:
                         continue
                         
                     distance = distances[dest]
-                    if distance == float('inf'):
+                    if distance == math.inf:
                         continue
                         
-                    next_hop = first_hop(self.nombre, dest, predecessors)
+                    next_hop = saltos.get(dest)
                     if next_hop:
                         nueva_tabla[dest] = {
                             'next_hop': next_hop,
@@ -345,7 +455,10 @@ class LinkStateTerminal:
                 cambios = self._detectar_cambios_tabla(nueva_tabla)
                 self.routing_table = nueva_tabla
                 
-                if cambios:
+                # Avisar solo con la tabla ya publicada: main la muestra al despertar
+                self._verificar_lsdb_completa()
+                
+                if cambios and self.verbose:
                     print(f"   ✅ Tabla actualizada (versión {self.topology_version})")
                     self.mostrar_tabla_compacta()
                     
@@ -424,11 +537,11 @@ class LinkStateTerminal:
                 sock.settimeout(5.0)
                 sock.connect((self.host, self.puertos_nodos[siguiente_nodo]))
                 
-                sock.send(json.dumps(mensaje).encode('utf-8'))
+                enviar_frame(sock, dumps(mensaje))
                 
-                respuesta = sock.recv(1024).decode('utf-8')
+                respuesta = recibir_frame(sock)
                 if respuesta:
-                    confirmacion = json.loads(respuesta)
+                    confirmacion = loads(respuesta)
                     print(f"   ✅ Mensaje enviado: {confirmacion.get('estado', 'ok')}")
                     self.mensajes_enviados += 1
                     return True
@@ -451,7 +564,7 @@ class LinkStateTerminal:
             for dest in sorted(self.routing_table.keys()):
                 info = self.routing_table[dest]
                 ruta_str = ' -> '.join(info['path'])
-                dist_str = str(int(info['distance'])) if info['distance'] != float('inf') else "∞"
+                dist_str = str(int(info['distance'])) if info['distance'] != math.inf else "∞"
                 print(f"{dest:<8} {info['next_hop']:<10} {dist_str:<10} {ruta_str}")
         print()
         
@@ -570,34 +683,38 @@ class LinkStateTerminal:
         self.activo = False
         if self.servidor_socket:
             self.servidor_socket.close()
+        # Descartar el trabajo en cola y desbloquear los hilos que esperan en un
+        # socket, para no retrasar la salida hasta que venzan sus timeouts
+        self.pool_conexiones.shutdown(wait=False, cancel_futures=True)
+        self.pool_envios.shutdown(wait=False, cancel_futures=True)
+        with self._lock_conexiones:
+            abiertas = list(self._conexiones_abiertas)
+        for sock in abiertas:
+            self._cortar_conexion(sock)
 
 def main():
-    if len(sys.argv) != 2:
-        print("Uso: python link_state_terminal.py <nombre_nodo>")
+    if len(sys.argv) not in (2, 3):
+        print("Uso: python link_state_terminal.py <nombre_nodo> [--silencioso]")
         print("Nodos disponibles: A, B, C, D, E, F, G, H, I")
         sys.exit(1)
         
     nombre = sys.argv[1].upper().strip()
     
-    puertos = {
-        'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
-        'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
-    }
-    
-    if nombre not in puertos:
+    if nombre not in PUERTOS_NODOS:
         print(f"❌ Nodo '{nombre}' no válido")
-        print("Nodos disponibles:", ", ".join(puertos.keys()))
+        print("Nodos disponibles:", ", ".join(PUERTOS_NODOS.keys()))
         sys.exit(1)
         
-    puerto = puertos[nombre]
-    nodo = LinkStateTerminal(nombre, puerto)
+    puerto = PUERTOS_NODOS[nombre]
+    verbose = '--silencioso' not in sys.argv[2:]
+    nodo = LinkStateTerminal(nombre, puerto, verbose)
     
     # Iniciar servidor en hilo separado
     servidor_thread = threading.Thread(target=nodo.iniciar_servidor, daemon=True)
     servidor_thread.start()
     
-    # Esperar a que el servidor se inicie
-    time.sleep(1)
+    # Esperar a que el servidor esté escuchando (máximo 1 segundo)
+    nodo.servidor_listo.wait(timeout=1)
     
     # Generar y propagar LSP inicial
     print("🚀 Iniciando protocolo Link State...")
@@ -606,7 +723,7 @@ def main():
     nodo.calcular_tabla_enrutamiento()
     
     # Mostrar tabla inicial
-    time.sleep(2)  # Dar tiempo para recibir otros LSPs
+    nodo.lsdb_completa.wait(timeout=2)  # Hasta tener todos los LSPs (máximo 2 segundos)
     nodo.mostrar_tabla_enrutamiento()
     
     # Iniciar menú interactivo
@@ -2,6 +2,8 @@ import socket
 import json
 import threading
 import time
+import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Set
 from dijkstra import dijkstra
 from grafo import grafo
@@ -21,6 +23,7 @@ class Nodo:
         # Sockets
         self.servidor_socket = None
         self.activo = True
+        self.detenido = threading.Event()  # Se activa al llamar a detener()
         
         # Puertos de otros nodos (se configurará externamente)
         self.puertos_nodos = {}
@@ -68,7 +71,7 @@ class Nodo:
         """Calcula las distancias usando Dijkstra desde este nodo"""
         distancias, predecesores = dijkstra(self.grafo, self.nombre)
         self.tabla_distancias = {dest: dist for dest, dist in distancias.items() 
-                               if dist != float('inf')}
+                               if dist != math.inf}
         
         # Construir rutas
         self.tabla_rutas = {}
@@ -103,28 +106,35 @@ class Nodo:
         
     def solicitar_distancias_vecinos(self):
         """Solicita las tablas de distancias a los nodos vecinos"""
-        distancias_vecinos = {}
-        
-        for vecino in self.vecinos:
-            if vecino in self.puertos_nodos:
-                try:
-                    cliente = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    cliente.connect((self.host, self.puertos_nodos[vecino]))
-                    
-                    solicitud = {'tipo': 'solicitud_distancias', 'nodo': self.nombre}
-                    cliente.send(json.dumps(solicitud).encode())
-                    
-                    respuesta = cliente.recv(1024).decode()
-                    datos = json.loads(respuesta)
-                    
-                    if datos['tipo'] == 'respuesta_distancias':
-                        distancias_vecinos[vecino] = datos['distancias']
-                        
-                    cliente.close()
-                except Exception as e:
-                    print(f"Error conectando con {vecino}: {e}")
-                    
-        return distancias_vecinos
+        vecinos = [v for v in self.vecinos if v in self.puertos_nodos]
+        if not vecinos:
+            return {}
+            
+        # Consultar a todos los vecinos a la vez: la espera total es la del más lento
+        with ThreadPoolExecutor(max_workers=len(vecinos)) as pool:
+            respuestas = list(pool.map(self.solicitar_distancias_vecino, vecinos))
+            
+        return {vecino: distancias for vecino, distancias in zip(vecinos, respuestas)
+                if distancias is not None}
+        
+    def solicitar_distancias_vecino(self, vecino: str) -> Optional[Dict]:
+        """Solicita la tabla de distancias a un vecino (None si no responde)"""
+        try:
+            cliente = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            cliente.connect((self.host, self.puertos_nodos[vecino]))
+            
+            solicitud = {'tipo': 'solicitud_distancias', 'nodo': self.nombre}
+            cliente.send(json.dumps(solicitud).encode())
+            
+            respuesta = cliente.recv(1024).decode()
+            datos = json.loads(respuesta)
+            
+            cliente.close()
+            if datos['tipo'] == 'respuesta_distancias':
+                return datos['distancias']
+        except Exception as e:
+            print(f"Error conectando con {vecino}: {e}")
+        return None
         
     def procesar_actualizacion(self, mensaje):
         """Procesa actualizaciones de distancias recibidas"""
@@ -142,6 +152,7 @@ class Nodo:
     def detener(self):
         """Detiene el nodo"""
         self.activo = False
+        self.detenido.set()
         if self.servidor_socket:
             self.servidor_socket.close()
 
@@ -161,10 +172,10 @@ def ejecutar_nodo(nombre: str, puerto: int, grafo_red: grafo, puertos_nodos: Dic
     # Calcular tabla local
     nodo.calcular_tabla_local()
     
-    # Mantener el nodo activo
+    # Mantener el nodo activo hasta que se detenga (timeout para atender Ctrl+C en Windows)
     try:
-        while nodo.activo:
-            time.sleep(1)
+        while not nodo.detenido.wait(timeout=1):
+            pass
     except KeyboardInterrupt:
         print(f"\nDeteniendo nodo {nombre}")
         nodo.detener()
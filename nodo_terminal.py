@@ -1,7 +1,7 @@
 import socket
 import json
 import threading
-import time
+import math
 from typing import Dict, List, Optional
 from dijkstra import dijkstra
 from grafo import grafo
@@ -21,6 +21,7 @@ class NodoRouter:
         # Socket servidor
         self.servidor_socket = None
         self.activo = True
+        self.servidor_listo = threading.Event()  # Se activa cuando el socket ya escucha
         
         # Puertos de otros nodos
         self.puertos_nodos = {
@@ -44,7 +45,7 @@ class NodoRouter:
         distancias, predecesores = dijkstra(self.grafo, self.nombre)
         
         for destino in self.grafo.routers:
-            if destino != self.nombre and distancias[destino] != float('inf'):
+            if destino != self.nombre and distancias[destino] != math.inf:
                 # Reconstruir ruta
                 ruta = []
                 actual = destino
@@ -66,6 +67,7 @@ class NodoRouter:
         try:
             self.servidor_socket.bind((self.host, self.puerto))
             self.servidor_socket.listen(5)
+            self.servidor_listo.set()
             print(f"\n🟢 NODO {self.nombre} ACTIVO en puerto {self.puerto}")
             print(f"Esperando paquetes...")
             
@@ -311,8 +313,8 @@ def main():
     servidor_thread.daemon = True
     servidor_thread.start()
     
-    # Esperar un momento para que el servidor se inicie
-    time.sleep(1)
+    # Esperar a que el servidor esté escuchando (máximo 1 segundo)
+    nodo.servidor_listo.wait(timeout=1)
     
     # Mostrar tabla inicial
     nodo.mostrar_tabla_enrutamiento()
@@ -0,0 +1,93 @@
+"""
+Utilidades compartidas del protocolo entre nodos Link State
+Serialización de mensajes JSON para los sockets (usa orjson si está instalado)
+y framing con prefijo de longitud para delimitar cada mensaje en el stream TCP
+"""
+
+import json
+import struct
+import types
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional, se usa json estándar como respaldo
+    orjson = None
+
+
+# Puertos fijos de la red (A-I). Es de solo lectura y se comparte entre
+# todas las instancias en lugar de reconstruir el diccionario en cada una.
+PUERTOS_NODOS = types.MappingProxyType({
+    'A': 65001, 'B': 65002, 'C': 65003, 'D': 65004, 'E': 65005,
+    'F': 65006, 'G': 65007, 'H': 65008, 'I': 65009
+})
+
+# Respaldo sin orjson: sin espacios tras ',' y ':' (igual que orjson) para que los
+# mensajes sean más cortos en el cable. Se construye una sola vez porque json.dumps
+# con argumentos no por defecto crea un JSONEncoder nuevo en cada llamada.
+_CODIFICADOR_COMPACTO = json.JSONEncoder(separators=(',', ':'))
+
+# Cabecera de cada frame: longitud del mensaje como entero sin signo de 4 bytes big-endian
+_CABECERA = struct.Struct('>I')
+
+# Tamaño máximo aceptado para un mensaje (1 MiB). La longitud la manda el otro
+# extremo: sin este límite una cabecera corrupta haría reservar hasta 4 GiB.
+MAX_FRAME = 1024 * 1024
+
+
+def dumps(mensaje: dict) -> bytes:
+    """Serializa un mensaje a bytes UTF-8 listos para enviar por el socket"""
+    if orjson is not None:
+        return orjson.dumps(mensaje)
+    return _CODIFICADOR_COMPACTO.encode(mensaje).encode('utf-8')
+
+
+def loads(data) -> dict:
+    """Deserializa un mensaje recibido (acepta bytes o str, sin decodificar antes)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def armar_frame(payload: bytes) -> bytes:
+    """
+    Antepone la longitud (4 bytes big-endian) al mensaje serializado.
+    Útil para armar el frame una sola vez cuando se envía a varios destinos.
+    """
+    return _CABECERA.pack(len(payload)) + payload
+
+
+def enviar_frame(sock, payload: bytes) -> None:
+    """Envía un mensaje serializado precedido por su longitud (4 bytes big-endian)"""
+    sock.sendall(armar_frame(payload))
+
+
+def recibir_frame(sock):
+    """
+    Recibe un mensaje completo enviado con enviar_frame.
+    Devuelve None si la conexión se cerró antes de completarlo o si la
+    cabecera anuncia más de MAX_FRAME bytes (el llamador cierra la conexión).
+    """
+    cabecera = _recibir_exacto(sock, _CABECERA.size)
+    if cabecera is None:
+        return None
+    longitud = _CABECERA.unpack(cabecera)[0]
+    if longitud > MAX_FRAME:
+        return None
+    return _recibir_exacto(sock, longitud)
+
+
+def _recibir_exacto(sock, n: int):
+    """
+    Lee exactamente n bytes del socket (recv puede devolver menos).
+    Se escribe directamente en un único bytearray con recv_into, sin crear
+    un bytes intermedio por cada lectura ni unirlos al final.
+    """
+    buffer = bytearray(n)
+    vista = memoryview(buffer)
+    recibidos = 0
+    while recibidos < n:
+        leidos = sock.recv_into(vista[recibidos:])
+        if not leidos:
+            return None
+        recibidos += leidos
+    return buffer
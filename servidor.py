@@ -1,5 +1,7 @@
 import socket
 import json
+import math
+from functools import lru_cache
 from dijkstra import dijkstra
 from grafo import grafo
 
@@ -18,6 +20,11 @@ def cargar_grafo():
         g.agregar_conexion(a, b, w)
     return g
 
+@lru_cache(maxsize=64)
+def rutas_desde(g: grafo, origen: str):
+    # El grafo del servidor no cambia, así que Dijkstra se calcula una sola vez por origen
+    return dijkstra(g, origen)
+
 def main():
     grafo = cargar_grafo()
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -37,9 +44,9 @@ def main():
                     destino = mensaje['destino']
                     
                     # Calcular ruta usando dijkstra
-                    distancias, predecesores = dijkstra(grafo, origen)
+                    distancias, predecesores = rutas_desde(grafo, origen)
                     
-                    if destino not in distancias or distancias[destino] == float('inf'):
+                    if destino not in distancias or distancias[destino] == math.inf:
                         respuesta = {'error': f'No hay ruta desde {origen} hasta {destino}'}
                     else:
                         costo = distancias[destino]
@@ -4,9 +4,10 @@ Pruebas comparativas entre Link State Routing y cálculo estático con Dijkstra
 
 import time
 import json
+import math
 from typing import Dict, List
-from link_state import LinkStateNode, simulacion_link_state
-from dijkstra import construir_tablas_para_todos, imprimir_tabla
+from link_state import LSP, LinkStateDB, LinkStateNode, simulacion_link_state
+from dijkstra import construir_tablas_para_todos, imprimir_tabla, dijkstra, first_hop, primeros_saltos
 from grafo import grafo
 
 def crear_grafo_ejemplo():
@@ -64,13 +65,11 @@ def comparar_enrutamiento_estatico_vs_dinamico():
         nodos_ls[name] = LinkStateNode(name, neighbors)
     
     # Simular intercambio inicial de LSPs
-    all_lsps = []
-    for node in nodos_ls.values():
-        all_lsps.append(node.lsdb.lsp_db[node.name])
+    lsps_por_origen = {name: node.lsdb.lsp_db[name] for name, node in nodos_ls.items()}
     
-    for node in nodos_ls.values():
-        for lsp in all_lsps:
-            if lsp.source != node.name:
+    for name, node in nodos_ls.items():
+        for origen, lsp in lsps_por_origen.items():
+            if origen != name:
                 node.receive_lsp(lsp)
     
     print("\nTablas Link State después de convergencia inicial:")
@@ -89,7 +88,7 @@ def comparar_enrutamiento_estatico_vs_dinamico():
         # Obtener rutas estáticas
         rutas_estaticas = {}
         for destino, next_hop, costo, ruta in tablas_estaticas[nodo_origen]:
-            if destino != nodo_origen and costo != float('inf'):
+            if destino != nodo_origen and costo != math.inf:
                 rutas_estaticas[destino] = {
                     'next_hop': next_hop,
                     'costo': costo,
@@ -100,7 +99,7 @@ def comparar_enrutamiento_estatico_vs_dinamico():
         rutas_ls = nodos_ls[nodo_origen].routing_table
         
         # Comparar cada destino
-        for destino in sorted(set(rutas_estaticas.keys()) | set(rutas_ls.keys())):
+        for destino in sorted(rutas_estaticas.keys() | rutas_ls.keys()):
             if destino == nodo_origen:
                 continue
                 
@@ -157,13 +156,11 @@ def probar_escenarios_dinamicos():
         nodos[name] = LinkStateNode(name, neighbors)
     
     # Convergencia inicial
-    all_lsps = []
-    for node in nodos.values():
-        all_lsps.append(node.lsdb.lsp_db[node.name])
+    lsps_por_origen = {name: node.lsdb.lsp_db[name] for name, node in nodos.items()}
     
-    for node in nodos.values():
-        for lsp in all_lsps:
-            if lsp.source != node.name:
+    for name, node in nodos.items():
+        for origen, lsp in lsps_por_origen.items():
+            if origen != name:
                 node.receive_lsp(lsp)
     
     print("\n🔧 ESCENARIO 1: Mejora de enlace")
@@ -181,8 +178,9 @@ def probar_escenarios_dinamicos():
     
     # Propagar cambios
     new_lsps = [nodos['A'].lsdb.lsp_db['A'], nodos['C'].lsdb.lsp_db['C']]
+    excluidos = frozenset({'A', 'C'})
     for node in nodos.values():
-        if node.name not in ['A', 'C']:
+        if node.name not in excluidos:
             for lsp in new_lsps:
                 node.receive_lsp(lsp)
     
@@ -215,8 +213,9 @@ def probar_escenarios_dinamicos():
         nodos['D'].lsdb.lsp_db['D']
     ]
     
+    excluidos = frozenset({'I', 'A', 'D'})
     for node in nodos.values():
-        if node.name not in ['I', 'A', 'D']:
+        if node.name not in excluidos:
             for lsp in partition_lsps:
                 node.receive_lsp(lsp)
     
@@ -239,8 +238,9 @@ def probar_escenarios_dinamicos():
     
     # Propagar reconexión
     reconnect_lsps = [nodos['I'].lsdb.lsp_db['I'], nodos['D'].lsdb.lsp_db['D']]
+    excluidos = frozenset({'I', 'D'})
     for node in nodos.values():
-        if node.name not in ['I', 'D']:
+        if node.name not in excluidos:
             for lsp in reconnect_lsps:
                 node.receive_lsp(lsp)
     
@@ -285,6 +285,122 @@ def analisis_convergencia():
     print("• Escalabilidad: Mejor vs Limitada")
     print("• Complejidad: Mayor vs Menor")
 
+def _resumen_grafo(g: grafo):
+    """Routers y enlaces de un grafo, sin las entradas vacías que deja el defaultdict"""
+    return sorted(g.routers), {r: dict(v) for r, v in g.conexiones.items() if v}
+
+def _grafo_desde_lsdb(db: LinkStateDB) -> grafo:
+    """Reconstruye desde cero el grafo de la LSDB (como se hacía antes del grafo incremental)"""
+    g = grafo()
+    for source, lsp in db.lsp_db.items():
+        for neighbor, cost in lsp.neighbors.items():
+            g.agregar_conexion(source, neighbor, cost, bidireccional=False)
+    return g
+
+def verificar_grafo_incremental():
+    """
+    Verifica que el grafo incremental de la LSDB y los next-hops calculados en
+    una sola pasada coincidan con sus versiones originales (reconstruir el grafo
+    desde cero y recorrer la cadena de predecesores con first_hop).
+    """
+    
+    print("\n" + "="*80)
+    print("VERIFICACIÓN DEL GRAFO INCREMENTAL Y DE LOS NEXT-HOPS")
+    print("="*80)
+    
+    topologia = {
+        "A": {"B": 7, "I": 1, "C": 7},
+        "B": {"A": 7, "F": 2},
+        "C": {"A": 7, "D": 5},
+        "D": {"I": 6, "C": 5, "F": 1, "E": 1},
+        "E": {"D": 1, "G": 4},
+        "F": {"B": 2, "D": 1, "G": 3, "H": 4},
+        "G": {"F": 3, "E": 4},
+        "H": {"F": 4},
+        "I": {"A": 1, "D": 6}
+    }
+    ahora = time.time()
+    antiguo = ahora - 1000  # Vence con cleanup_old_lsps(max_age=300)
+    
+    db = LinkStateDB()
+    errores = 0
+    
+    def comparar(paso: str):
+        nonlocal errores
+        incremental = db.get_topology_graph()
+        desde_cero = _grafo_desde_lsdb(db)
+        # Imprimir el grafo lee conexiones[r] de cada router, como hace el resto del código
+        str(incremental)
+        if _resumen_grafo(incremental) == _resumen_grafo(desde_cero):
+            print(f"  ✅ {paso}: grafos iguales ({len(desde_cero.routers)} routers)")
+        else:
+            errores += 1
+            print(f"  ❌ {paso}: DIFERENCIA!")
+            print(f"     incremental: {_resumen_grafo(incremental)}")
+            print(f"     desde cero:  {_resumen_grafo(desde_cero)}")
+    
+    print("\n🔧 Secuencia de actualizaciones y vencimientos")
+    print("-" * 40)
+    
+    # G y H con LSPs viejos: vencerán en la limpieza
+    for name, neighbors in topologia.items():
+        db.update_lsp(LSP(name, 1, 0, neighbors, antiguo if name in ("G", "H") else ahora))
+    comparar("LSDB inicial")
+    
+    db.update_lsp(LSP("A", 2, 0, {"B": 7, "C": 2}, ahora))
+    comparar("A pierde el enlace con I y mejora A-C")
+    
+    db.update_lsp(LSP("I", 2, 0, {}, ahora))
+    comparar("I sin vecinos (D todavía llega a I)")
+    
+    db.update_lsp(LSP("D", 2, 0, {"C": 5, "F": 1, "E": 1}, ahora))
+    comparar("D pierde el enlace con I (I queda aislado)")
+    
+    db.update_lsp(LSP("D", 2, 0, {"C": 5, "F": 1, "E": 1, "I": 6}, ahora))
+    comparar("Mismo número de secuencia con contenido distinto")
+    
+    # Muchas versiones de un mismo nodo: el heap de vencimientos se reconstruye
+    for seq in range(3, 30):
+        db.update_lsp(LSP("B", seq, 0, {"A": 7, "F": 2} if seq % 2 else {"F": 2}, ahora))
+    comparar("Actualizaciones repetidas de B")
+    
+    db.cleanup_old_lsps(max_age=300)
+    comparar("Vencimiento de G y H")
+    
+    db.update_lsp(LSP("G", 5, 0, {"F": 3}, ahora))
+    comparar("G vuelve a anunciarse")
+    
+    # El grafo incremental debe dar las mismas tablas que el reconstruido
+    if (construir_tablas_para_todos(db.get_topology_graph(), incluir_ruta=True)
+            == construir_tablas_para_todos(_grafo_desde_lsdb(db), incluir_ruta=True)):
+        print("  ✅ Tablas de enrutamiento iguales con ambos grafos")
+    else:
+        errores += 1
+        print("  ❌ Tablas de enrutamiento distintas!")
+    
+    print("\n🔧 primeros_saltos vs first_hop")
+    print("-" * 40)
+    
+    for nombre_grafo, g in (("ejemplo", crear_grafo_ejemplo()), ("LSDB final", _grafo_desde_lsdb(db))):
+        diferencias = 0
+        for source in sorted(g.routers):
+            _, prev = dijkstra(g, source)
+            saltos = primeros_saltos(source, prev)
+            for dest in sorted(g.routers):
+                if saltos.get(dest) != first_hop(source, dest, prev):
+                    diferencias += 1
+                    print(f"  ❌ {source}->{dest}: {saltos.get(dest)} vs {first_hop(source, dest, prev)}")
+        if diferencias:
+            errores += diferencias
+        else:
+            print(f"  ✅ Grafo {nombre_grafo}: next-hops iguales para todos los pares")
+    
+    if errores == 0:
+        print("\n✅ RESULTADO: Las versiones incrementales coinciden con las originales!")
+    else:
+        print(f"\n❌ RESULTADO: Se encontraron {errores} diferencias.")
+    return errores == 0
+
 def main():
     """Función principal que ejecuta todas las pruebas"""
     
@@ -300,7 +416,10 @@ def main():
     # 3. Análisis de convergencia
     analisis_convergencia()
     
-    # 4. Ejecutar simulación completa
+    # 4. Grafo incremental y next-hops contra sus versiones originales
+    verificar_grafo_incremental()
+    
+    # 5. Ejecutar simulación completa
     print("\n" + "="*80)
     print("EJECUTANDO SIMULACIÓN COMPLETA")
     print("="*80)